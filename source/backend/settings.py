@@ -47,11 +47,13 @@ class Dev(Configuration):
         'django.contrib.sessions',
         'django.contrib.messages',
         'django.contrib.staticfiles',
+        'django.contrib.postgres',
         'user.apps.UserConfig',
         'catering_establishment.apps.CateringEstablishmentConfig',
         'common.apps.CommonConfig',
         'dish.apps.DishConfig',
         'location.apps.LocationConfig',
+        'uploads.apps.UploadsConfig',
         'corsheaders',
         'rest_framework',
         'rest_framework_simplejwt',
@@ -121,6 +123,24 @@ class Dev(Configuration):
         }
     }
 
+    CACHES = {
+        'default': {
+            'BACKEND': values.Value('django.core.cache.backends.locmem.LocMemCache', environ_name='CACHE_BACKEND'),
+            'LOCATION': values.Value('', environ_name='CACHE_LOCATION'),
+        }
+    }
+
+    CATALOG_CACHE_TIMEOUT = values.IntegerValue(300)
+    CATALOG_PROJECTION_ENABLED = values.BooleanValue(False)
+    CATALOG_PROJECTION_REFRESH_DELAY = values.FloatValue(5.0)
+    MENU_CACHE_TIMEOUT = values.IntegerValue(600)
+
+    IMAGE_PROCESSING_WORKERS = values.IntegerValue(2)
+    MEDIA_COLLECTION_DELAY = values.FloatValue(30.0)
+    MEDIA_COLLECTION_BATCH_SIZE = values.IntegerValue(500)
+    MEDIA_IO_WORKERS = values.IntegerValue(4)
+    UPLOADED_MEDIA_MAX_AGE = values.IntegerValue(24 * 60 * 60)
+
     # Password validation
     # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
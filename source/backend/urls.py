@@ -32,4 +32,5 @@ urlpatterns = [
     path('catering_establishment/', include('catering_establishment.urls')),
     path('dish/', include('dish.urls')),
     path('location/', include('location.urls')),
+    path('uploaded_media/', include('uploads.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,8 @@
+"""
+Catering establishment response caches.
+"""
+from django.conf import settings
+
+from common.cache import VersionedCache
+
+catalog_cache = VersionedCache('catalog', timeout=settings.CATALOG_CACHE_TIMEOUT)
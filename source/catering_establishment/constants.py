@@ -2,3 +2,6 @@ CATERING_ESTABLISHMENTS_NAME_MAX_LENGTH = 64
 PHOTOS_FOLDER_NAME = 'photos'
 MEDIA_FOLDER_NAME = 'catering_establishment'
 CUT_CATERING_ESTABLISHMENTS_DESCRIPTION_LENGTH = 200
+DEFAULT_BOOKING_DURATION_MINUTES = 120
+REVENUE_STATISTICS_BUCKETS = ('hour', 'day', 'week', 'month')
+REVENUE_STATISTICS_HOURLY_MAX_DAYS = 31
@@ -0,0 +1,16 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException, ErrorDetail
+
+
+class BookingConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _('The table is already booked for the requested time.')
+    default_code = 'booking_conflict'
+
+    def __init__(self, nearest_free_slot=None):
+        super().__init__()
+        self.detail = {
+            'detail': ErrorDetail(str(self.default_detail), self.default_code),
+            'nearest_free_slot': nearest_free_slot,
+        }
@@ -1,5 +1,12 @@
+from datetime import timedelta
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
 from django_filters import rest_framework as filters
 
+from catering_establishment.constants import DEFAULT_BOOKING_DURATION_MINUTES
+from catering_establishment.models import CateringEstablishmentTable, get_availability_conditions, get_open_at_condition
 from common.filters import NumberInFilter
 from common.utils import get_end_of_date, get_start_of_date
 
@@ -7,10 +14,54 @@ from common.utils import get_end_of_date, get_start_of_date
 class CateringEstablishmentCatalogFilter(filters.FilterSet):
     rating_min = filters.NumberFilter(field_name='rating', lookup_expr='gte')
     rating_max = filters.NumberFilter(field_name='rating', lookup_expr='lte')
-    address__name = filters.CharFilter(lookup_expr='icontains')
+    address__name = filters.CharFilter(lookup_expr='trigram_icontains')
+    address__name__similar = filters.CharFilter(field_name='address__name', method='filter_similar_address_name')
     settlement = filters.NumberFilter()
     region = filters.NumberFilter()
     country = filters.NumberFilter()
+    open_at = filters.TimeFilter(method='filter_open_at')
+    open_now = filters.BooleanFilter(method='filter_open_now')
+    available_at = filters.IsoDateTimeFilter(method='filter_available_at')
+    party_size = filters.NumberFilter(method='filter_party_size')
+
+    work_hours_prefix = 'work_hours__'
+
+    def filter_similar_address_name(self, queryset, name, value):
+        return (
+            queryset.filter(**{f'{name}__trigram_word_similar': value})
+            .annotate(address_similarity=TrigramWordSimilarity(value, name))
+            .order_by('-address_similarity')
+        )
+
+    def filter_open_at(self, queryset, _, value):
+        return queryset.filter(get_open_at_condition(value, self.work_hours_prefix))
+
+    def filter_open_now(self, queryset, _, value):
+        return self.filter_open_at(queryset, _, timezone.localtime().time()) if value else queryset
+
+    def filter_available_at(self, queryset, _, value):
+        party_size = self.form.cleaned_data.get('party_size') or 1
+        end_datetime = value + timedelta(minutes=DEFAULT_BOOKING_DURATION_MINUTES)
+        return queryset.filter(*get_availability_conditions(value, end_datetime, party_size, self.work_hours_prefix))
+
+    def filter_party_size(self, queryset, _, value):
+        if self.form.cleaned_data.get('available_at'):
+            # The party size is taken into account by the availability filter.
+            return queryset
+        return queryset.filter(
+            Exists(
+                CateringEstablishmentTable.objects.filter(
+                    catering_establishment=OuterRef('pk'), serving_clients_number__gte=value
+                )
+            )
+        )
+
+
+class CateringEstablishmentCatalogProjectionFilter(CateringEstablishmentCatalogFilter):
+    address__name = filters.CharFilter(field_name='address_name', lookup_expr='trigram_icontains')
+    address__name__similar = filters.CharFilter(field_name='address_name', method='filter_similar_address_name')
+
+    work_hours_prefix = 'work_hours_'
 
 
 class BookingFilter(filters.FilterSet):
@@ -1,12 +1,115 @@
-from django.db.models.signals import post_delete
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
 
 from catering_establishment import models as ce_models
+from catering_establishment.caches import catalog_cache
+from catering_establishment.services import (
+    change_daily_booking_statistics,
+    change_daily_paid_bookings_statistics,
+    schedule_catalog_projection_refresh,
+)
+from location.models import Address
+from uploads.services import release_image
 
 
 @receiver(post_delete, sender=ce_models.CateringEstablishmentPhoto)
 def delete_media_file(sender, instance, *args, **kwargs):
-    try:
-        instance.photo.delete(save=False)
-    except:
-        pass
+    release_image(instance.photo.name)
+
+
+@receiver(post_delete, sender=ce_models.CateringEstablishmentRating)
+def exclude_rating_from_aggregates(sender, instance, *args, **kwargs):
+    ce_models.CateringEstablishment.objects.filter(pk=instance.catering_establishment_id).change_rating_aggregates(
+        -instance.rating, -1
+    )
+
+
+@receiver(post_save, sender=ce_models.CateringEstablishment)
+def update_search_vector(sender, instance, update_fields=None, *args, **kwargs):
+    if update_fields and not {'name', 'description'} & set(update_fields):
+        return
+    ce_models.CateringEstablishment.objects.filter(pk=instance.pk).update_search_vector()
+
+
+@receiver(post_save, sender=ce_models.CateringEstablishment)
+@receiver(post_delete, sender=ce_models.CateringEstablishment)
+@receiver(post_save, sender=ce_models.CateringEstablishmentPhoto)
+@receiver(post_delete, sender=ce_models.CateringEstablishmentPhoto)
+@receiver(post_save, sender=ce_models.CateringEstablishmentRating)
+@receiver(post_delete, sender=ce_models.CateringEstablishmentRating)
+@receiver(post_save, sender=ce_models.CateringEstablishmentTable)
+@receiver(post_delete, sender=ce_models.CateringEstablishmentTable)
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+@receiver(post_save, sender=ce_models.WorkHours)
+@receiver(post_delete, sender=ce_models.WorkHours)
+def invalidate_catalog_cache(sender, *args, **kwargs):
+    transaction.on_commit(catalog_cache.bump_version)
+    if settings.CATALOG_PROJECTION_ENABLED:
+        transaction.on_commit(schedule_catalog_projection_refresh)
+
+
+@receiver(post_init, sender=ce_models.Booking)
+def remember_booking_statistics_values(sender, instance, *args, **kwargs):
+    # Values are read from the instance dictionary, so that deferred fields are not loaded.
+    instance.statistics_values = (
+        instance.__dict__.get('catering_establishment_table_id'),
+        instance.__dict__.get('start_datetime'),
+        instance.__dict__.get('guests_count'),
+    )
+
+
+@receiver(pre_save, sender=ce_models.Booking)
+def remember_previous_booking_statistics_values(sender, instance, *args, **kwargs):
+    if instance._state.adding:
+        instance.previous_statistics_values = None
+    elif None in instance.statistics_values:
+        instance.previous_statistics_values = (
+            ce_models.Booking.objects.filter(pk=instance.pk)
+            .values_list('catering_establishment_table', 'start_datetime', 'guests_count')
+            .first()
+        )
+    else:
+        instance.previous_statistics_values = instance.statistics_values
+
+    # The guests are fixed when the table is booked, so that later changes of its seats do not skew the statistics.
+    previous_table_id = instance.previous_statistics_values and instance.previous_statistics_values[0]
+    if instance.catering_establishment_table_id != previous_table_id:
+        instance.guests_count = (
+            ce_models.CateringEstablishmentTable.objects.filter(pk=instance.catering_establishment_table_id)
+            .values_list('serving_clients_number', flat=True)
+            .first()
+        ) or 0
+
+
+@receiver(post_save, sender=ce_models.Booking)
+def add_booking_to_statistics(sender, instance, created, *args, **kwargs):
+    statistics_values = (instance.catering_establishment_table_id, instance.start_datetime, instance.guests_count)
+    if created:
+        change_daily_booking_statistics(*statistics_values)
+    elif instance.previous_statistics_values not in (None, statistics_values):
+        is_paid = ce_models.BookingPayment.objects.filter(booking=instance.pk).exists()
+        change_daily_booking_statistics(*instance.previous_statistics_values, sign=-1, is_paid=is_paid)
+        change_daily_booking_statistics(*statistics_values, is_paid=is_paid)
+    instance.statistics_values = statistics_values
+
+
+@receiver(post_delete, sender=ce_models.Booking)
+def subtract_booking_from_statistics(sender, instance, *args, **kwargs):
+    # The payment of the booking is deleted before it and subtracts itself from the paid bookings count.
+    change_daily_booking_statistics(
+        instance.catering_establishment_table_id, instance.start_datetime, instance.guests_count, sign=-1
+    )
+
+
+@receiver(post_save, sender=ce_models.BookingPayment)
+def add_booking_payment_to_statistics(sender, instance, created, *args, **kwargs):
+    if created:
+        change_daily_paid_bookings_statistics(instance.booking_id)
+
+
+@receiver(post_delete, sender=ce_models.BookingPayment)
+def subtract_booking_payment_from_statistics(sender, instance, *args, **kwargs):
+    change_daily_paid_bookings_statistics(instance.booking_id, sign=-1)
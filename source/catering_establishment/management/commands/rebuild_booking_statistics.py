@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catering_establishment.services import rebuild_daily_booking_statistics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily booking statistics of catering establishments from all recorded bookings.'
+
+    def handle(self, *args, **options):
+        rebuild_daily_booking_statistics()
+        self.stdout.write(self.style.SUCCESS('Daily booking statistics have been rebuilt.'))
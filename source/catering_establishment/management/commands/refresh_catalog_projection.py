@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catering_establishment.services import refresh_catalog_projection
+
+
+class Command(BaseCommand):
+    help = 'Concurrently refresh the materialized catering establishments catalog projection.'
+
+    def handle(self, *args, **options):
+        refresh_catalog_projection()
+        self.stdout.write(self.style.SUCCESS('Catalog projection has been refreshed.'))
@@ -0,0 +1,47 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:07
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    CateringEstablishment = apps.get_model('catering_establishment', 'CateringEstablishment')
+    CateringEstablishmentRating = apps.get_model('catering_establishment', 'CateringEstablishmentRating')
+
+    ratings = (
+        CateringEstablishmentRating.objects.filter(catering_establishment=OuterRef('pk'))
+        .order_by()
+        .values('catering_establishment')
+    )
+    rating_sum = Coalesce(Subquery(ratings.annotate(value=Sum('rating')).values('value')), 0)
+    rating_count = Coalesce(Subquery(ratings.annotate(value=Count('id')).values('value')), 0)
+    CateringEstablishment.objects.update(rating_sum=rating_sum, rating_count=rating_count)
+    CateringEstablishment.objects.update(
+        rating=Cast('rating_sum', output_field=FloatField()) / Greatest('rating_count', 1),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0010_rename_number_cateringestablishment_enterprise_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cateringestablishment',
+            name='rating',
+            field=models.FloatField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cateringestablishment',
+            name='rating_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cateringestablishment',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_rating_aggregates, migrations.RunPython.noop),
+    ]
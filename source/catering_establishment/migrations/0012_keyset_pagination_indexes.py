@@ -0,0 +1,30 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0011_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['client', 'start_datetime', 'id'], name='catering_es_client__5c69c9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cateringestablishment',
+            index=models.Index(fields=['name', 'id'], name='catering_es_name_2c4fe4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cateringestablishment',
+            index=models.Index(fields=['rating', 'id'], name='catering_es_rating_d4eda3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cateringestablishmentfeedback',
+            index=models.Index(
+                fields=['catering_establishment', 'created', 'id'], name='catering_es_caterin_de4d92_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def fill_search_vectors(apps, schema_editor):
+    CateringEstablishment = apps.get_model('catering_establishment', 'CateringEstablishment')
+    CateringEstablishment.objects.update(
+        search_vector=(
+            SearchVector('name', weight='A', config='simple') + SearchVector('description', weight='B', config='simple')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0012_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cateringestablishment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='cateringestablishment',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_vector'], name='catering_es_search__2493ee_gin'
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
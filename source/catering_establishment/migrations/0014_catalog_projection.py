@@ -0,0 +1,70 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:11
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+CREATE_CATALOG_PROJECTION_SQL = '''
+CREATE MATERIALIZED VIEW catering_establishment_catalog AS
+SELECT
+    establishment.id,
+    establishment.name,
+    LEFT(establishment.description, 200) AS description,
+    (
+        SELECT photo.photo
+        FROM catering_establishment_cateringestablishmentphoto photo
+        WHERE photo.catering_establishment_id = establishment.id
+        ORDER BY photo.id
+        LIMIT 1
+    ) AS photo,
+    establishment.rating,
+    establishment.search_vector,
+    address.name AS address_name,
+    address.settlement_id,
+    settlement.region_id,
+    region.country_id
+FROM catering_establishment_cateringestablishment establishment
+JOIN location_address address ON address.id = establishment.address_id
+JOIN location_settlement settlement ON settlement.id = address.settlement_id
+JOIN location_region region ON region.id = settlement.region_id
+WHERE establishment.is_visible;
+
+CREATE UNIQUE INDEX catering_establishment_catalog_id ON catering_establishment_catalog (id);
+CREATE INDEX catering_establishment_catalog_name ON catering_establishment_catalog (name, id);
+CREATE INDEX catering_establishment_catalog_rating ON catering_establishment_catalog (rating, id);
+CREATE INDEX catering_establishment_catalog_settlement ON catering_establishment_catalog (settlement_id);
+CREATE INDEX catering_establishment_catalog_region ON catering_establishment_catalog (region_id);
+CREATE INDEX catering_establishment_catalog_country ON catering_establishment_catalog (country_id);
+CREATE INDEX catering_establishment_catalog_search_vector
+    ON catering_establishment_catalog USING gin (search_vector);
+CREATE INDEX catering_establishment_catalog_address_name
+    ON catering_establishment_catalog USING gin (address_name gin_trgm_ops);
+'''
+
+DROP_CATALOG_PROJECTION_SQL = 'DROP MATERIALIZED VIEW catering_establishment_catalog;'
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0013_full_text_search'),
+        ('location', '0002_address_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_CATALOG_PROJECTION_SQL, DROP_CATALOG_PROJECTION_SQL),
+        migrations.CreateModel(
+            name='CateringEstablishmentCatalogItem',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=64)),
+                ('description', models.CharField(max_length=200)),
+                ('photo', models.CharField(max_length=100, null=True)),
+                ('rating', models.FloatField()),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('address_name', models.CharField(max_length=256)),
+            ],
+            options={
+                'db_table': 'catering_establishment_catalog',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:12
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+catalog_projection_migration = import_module('catering_establishment.migrations.0014_catalog_projection')
+
+CREATE_CATALOG_PROJECTION_SQL = '''
+CREATE MATERIALIZED VIEW catering_establishment_catalog AS
+SELECT
+    establishment.id,
+    establishment.name,
+    LEFT(establishment.description, 200) AS description,
+    (
+        SELECT photo.photo
+        FROM catering_establishment_cateringestablishmentphoto photo
+        WHERE photo.catering_establishment_id = establishment.id
+        ORDER BY photo.id
+        LIMIT 1
+    ) AS photo,
+    establishment.rating,
+    establishment.search_vector,
+    address.name AS address_name,
+    work_hours.start_time AS work_hours_start_time,
+    work_hours.end_time AS work_hours_end_time,
+    address.settlement_id,
+    settlement.region_id,
+    region.country_id
+FROM catering_establishment_cateringestablishment establishment
+JOIN catering_establishment_workhours work_hours ON work_hours.id = establishment.work_hours_id
+JOIN location_address address ON address.id = establishment.address_id
+JOIN location_settlement settlement ON settlement.id = address.settlement_id
+JOIN location_region region ON region.id = settlement.region_id
+WHERE establishment.is_visible;
+
+CREATE UNIQUE INDEX catering_establishment_catalog_id ON catering_establishment_catalog (id);
+CREATE INDEX catering_establishment_catalog_name ON catering_establishment_catalog (name, id);
+CREATE INDEX catering_establishment_catalog_rating ON catering_establishment_catalog (rating, id);
+CREATE INDEX catering_establishment_catalog_settlement ON catering_establishment_catalog (settlement_id);
+CREATE INDEX catering_establishment_catalog_region ON catering_establishment_catalog (region_id);
+CREATE INDEX catering_establishment_catalog_country ON catering_establishment_catalog (country_id);
+CREATE INDEX catering_establishment_catalog_search_vector
+    ON catering_establishment_catalog USING gin (search_vector);
+CREATE INDEX catering_establishment_catalog_address_name
+    ON catering_establishment_catalog USING gin (address_name gin_trgm_ops);
+CREATE INDEX catering_establishment_catalog_work_hours
+    ON catering_establishment_catalog (work_hours_start_time, work_hours_end_time);
+CREATE INDEX catering_establishment_catalog_work_hours_end_time
+    ON catering_establishment_catalog (work_hours_end_time);
+'''
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0014_catalog_projection'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workhours',
+            index=models.Index(fields=['start_time', 'end_time'], name='catering_es_start_t_3d7e0c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workhours',
+            index=models.Index(fields=['end_time'], name='catering_es_end_tim_3e99df_idx'),
+        ),
+        migrations.RunSQL(
+            [catalog_projection_migration.DROP_CATALOG_PROJECTION_SQL, CREATE_CATALOG_PROJECTION_SQL],
+            [
+                catalog_projection_migration.DROP_CATALOG_PROJECTION_SQL,
+                catalog_projection_migration.CREATE_CATALOG_PROJECTION_SQL,
+            ],
+        ),
+    ]
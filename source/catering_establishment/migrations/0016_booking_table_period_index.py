@@ -0,0 +1,19 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0015_work_hours_filtering'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(
+                fields=['catering_establishment_table', 'start_datetime', 'end_datetime'],
+                name='catering_es_caterin_856d01_idx',
+            ),
+        ),
+    ]
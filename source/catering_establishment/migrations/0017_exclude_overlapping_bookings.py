@@ -0,0 +1,32 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:13
+
+import catering_establishment.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0016_booking_table_period_index'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=(
+                    (
+                        catering_establishment.models.TsTzRange(
+                            'start_datetime', 'end_datetime', django.contrib.postgres.fields.ranges.RangeBoundary()
+                        ),
+                        '&&',
+                    ),
+                    ('catering_establishment_table', '='),
+                ),
+                name='exclude_overlapping_table_bookings',
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:15
+
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def fill_daily_booking_statistics(apps, schema_editor):
+    Booking = apps.get_model('catering_establishment', 'Booking')
+    DailyBookingStatistics = apps.get_model('catering_establishment', 'DailyBookingStatistics')
+
+    statistics = (
+        Booking.objects.annotate(
+            catering_establishment=F('catering_establishment_table__catering_establishment'),
+            date=TruncDate('start_datetime'),
+        )
+        .order_by()
+        .values('catering_establishment', 'date')
+        .annotate(
+            bookings_count=Count('id'),
+            paid_bookings_count=Count('booking_payment'),
+            guests_count=Sum('catering_establishment_table__serving_clients_number'),
+        )
+    )
+    DailyBookingStatistics.objects.bulk_create(
+        (
+            DailyBookingStatistics(
+                catering_establishment_id=statistics_item.pop('catering_establishment'),
+                **statistics_item,
+            )
+            for statistics_item in statistics.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0017_exclude_overlapping_bookings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBookingStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('bookings_count', models.IntegerField(default=0)),
+                ('paid_bookings_count', models.IntegerField(default=0)),
+                ('guests_count', models.IntegerField(default=0)),
+                (
+                    'catering_establishment',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='daily_booking_statistics',
+                        to='catering_establishment.cateringestablishment',
+                    ),
+                ),
+            ],
+            options={
+                'unique_together': {('catering_establishment', 'date')},
+            },
+        ),
+        migrations.RunPython(fill_daily_booking_statistics, migrations.RunPython.noop),
+    ]
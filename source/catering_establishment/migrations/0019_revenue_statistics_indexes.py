@@ -0,0 +1,22 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0018_daily_booking_statistics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookingpayment',
+            index=models.Index(fields=['datetime', 'booking'], name='catering_es_datetim_40a017_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cateringestablishmentbalancechange',
+            index=models.Index(
+                fields=['catering_establishment', 'transaction_datetime'], name='catering_es_caterin_7211ba_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:22
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_photo_hashes(apps, schema_editor):
+    CateringEstablishmentPhoto = apps.get_model('catering_establishment', 'CateringEstablishmentPhoto')
+
+    instances = []
+    for instance in CateringEstablishmentPhoto.objects.only('id', 'photo').iterator():
+        try:
+            with instance.photo.open('rb') as photo_file:
+                instance.photo_hash = hashlib.sha256(photo_file.read()).hexdigest()
+        except (OSError, ValueError):
+            continue
+        instances.append(instance)
+    CateringEstablishmentPhoto.objects.bulk_update(instances, ('photo_hash',), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0019_revenue_statistics_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cateringestablishmentphoto',
+            name='photo_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(fill_photo_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.6 on 2026-10-18 10:12
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_guests_counts(apps, schema_editor):
+    Booking = apps.get_model('catering_establishment', 'Booking')
+    CateringEstablishmentTable = apps.get_model('catering_establishment', 'CateringEstablishmentTable')
+
+    serving_clients_number = CateringEstablishmentTable.objects.filter(
+        pk=OuterRef('catering_establishment_table')
+    ).values('serving_clients_number')
+    Booking.objects.update(guests_count=Subquery(serving_clients_number[:1]))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catering_establishment', '0020_photo_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='guests_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_guests_counts, migrations.RunPython.noop),
+    ]
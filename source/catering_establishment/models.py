@@ -4,14 +4,23 @@ Catering establishment models.
 from datetime import datetime
 
 from django.conf import settings
-from django.db import models
-from django.db.models import Avg, Count, ExpressionWrapper, F, Q
-from django.db.models.functions import Coalesce
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeBoundary, RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
+from django.db.models import Count, Exists, ExpressionWrapper, F, FloatField, Func, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.utils import timezone
 from django_extensions.db.models import TimeStampedModel
 
-from catering_establishment.constants import CATERING_ESTABLISHMENTS_NAME_MAX_LENGTH
-from common.models import TimeRangedModel
-from location.models import Address
+from catering_establishment.constants import (
+    CATERING_ESTABLISHMENTS_NAME_MAX_LENGTH,
+    CUT_CATERING_ESTABLISHMENTS_DESCRIPTION_LENGTH,
+)
+from common.constants import FULL_TEXT_SEARCH_CONFIG
+from common.models import DailyStatisticsManager, TimeRangedModel
+from location.models import Address, Country, Region, Settlement
 
 
 class WorkHours(models.Model):
@@ -21,17 +30,71 @@ class WorkHours(models.Model):
     def __str__(self):
         return f'{self.start_time} - {self.end_time}'
 
+    class Meta:
+        indexes = (
+            models.Index(fields=('start_time', 'end_time')),
+            models.Index(fields=('end_time',)),
+        )
+
+
+def get_open_at_condition(time, work_hours_prefix='work_hours__'):
+    """
+    Build a condition matching work hours that include the given time.
+
+    Work hours ending at or before their start cross midnight; equal bounds mean round-the-clock work.
+    """
+    start_time, end_time = f'{work_hours_prefix}start_time', f'{work_hours_prefix}end_time'
+    same_day_hours = Q(**{f'{start_time}__lt': F(end_time)}) & Q(
+        **{f'{start_time}__lte': time, f'{end_time}__gt': time}
+    )
+    overnight_hours = Q(**{f'{start_time}__gte': F(end_time)}) & (
+        Q(**{f'{start_time}__lte': time}) | Q(**{f'{end_time}__gt': time})
+    )
+    return same_day_hours | overnight_hours
+
 
 class CateringEstablishmentQuerySet(models.QuerySet):
     def visible_only(self):
         return super().filter(is_visible=True)
 
-    def with_avg_rating(self):
-        return super().prefetch_related('ratings').annotate(rating=Coalesce(Avg('ratings__rating'), 0.0))
+    def change_rating_aggregates(self, rating_sum_delta, rating_count_delta):
+        rating_sum = F('rating_sum') + rating_sum_delta
+        rating_count = F('rating_count') + rating_count_delta
+        return super().update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=Cast(rating_sum, output_field=FloatField()) / Greatest(rating_count, 1),
+        )
+
+    def update_search_vector(self):
+        return super().update(
+            search_vector=(
+                SearchVector('name', weight='A', config=FULL_TEXT_SEARCH_CONFIG)
+                + SearchVector('description', weight='B', config=FULL_TEXT_SEARCH_CONFIG)
+            )
+        )
 
     def with_photos(self):
         return super().prefetch_related('photos')
 
+    def open_at(self, time):
+        return super().filter(get_open_at_condition(time))
+
+    def with_free_tables_count(self, start_datetime, end_datetime, party_size):
+        free_tables_count = (
+            get_free_tables(start_datetime, end_datetime, party_size)
+            .filter(catering_establishment=OuterRef('pk'))
+            .order_by()
+            .values('catering_establishment')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        return super().annotate(free_tables_count=Coalesce(Subquery(free_tables_count), 0))
+
+    def with_cover_photo(self):
+        cover_photo = CateringEstablishmentPhoto.objects.filter(catering_establishment=OuterRef('pk')).order_by('id')
+        return super().annotate(cover_photo=Subquery(cover_photo.values('photo')[:1]))
+
     def with_location_data(self):
         return (
             super()
@@ -46,8 +109,40 @@ class CateringEstablishmentQuerySet(models.QuerySet):
     def with_tables_characteristics(self):
         return super().prefetch_related('tables')
 
-    def with_bookings_count(self):
-        return super().annotate(bookings_count=Count('tables__bookings'))
+    def with_bookings_statistics(self, start_date, end_date):
+        period = Q(daily_booking_statistics__date__range=(start_date, end_date))
+        return super().annotate(
+            bookings_count=Coalesce(Sum('daily_booking_statistics__bookings_count', filter=period), 0),
+            paid_bookings_count=Coalesce(Sum('daily_booking_statistics__paid_bookings_count', filter=period), 0),
+            guests_count=Coalesce(Sum('daily_booking_statistics__guests_count', filter=period), 0),
+        )
+
+
+def get_free_tables(start_datetime, end_datetime, party_size):
+    """
+    Tables seating the party that have no booking overlapping the period.
+    """
+    overlapping_bookings = Booking.objects.filter(
+        catering_establishment_table=OuterRef('pk'),
+        start_datetime__lt=end_datetime,
+        end_datetime__gt=start_datetime,
+    )
+    return CateringEstablishmentTable.objects.filter(
+        ~Exists(overlapping_bookings), serving_clients_number__gte=party_size
+    )
+
+
+def get_availability_conditions(start_datetime, end_datetime, party_size, work_hours_prefix='work_hours__'):
+    """
+    Build conditions matching establishments open at the start of the period with a free table for the party.
+    """
+    free_tables = get_free_tables(start_datetime, end_datetime, party_size).filter(
+        catering_establishment=OuterRef('pk')
+    )
+    return (
+        Exists(free_tables),
+        get_open_at_condition(timezone.localtime(start_datetime).time(), work_hours_prefix),
+    )
 
 
 class CateringEstablishmentManager(models.Manager):
@@ -57,26 +152,34 @@ class CateringEstablishmentManager(models.Manager):
     def visible_only(self):
         return self.get_queryset().visible_only()
 
-    def with_avg_rating(self):
-        return self.get_queryset().with_avg_rating()
-
     def with_location_data(self):
         return self.get_queryset().with_location_data()
 
+    def with_cover_photo(self):
+        return self.get_queryset().with_cover_photo()
+
+    def open_at(self, time):
+        return self.get_queryset().open_at(time)
+
+    def with_free_tables_count(self, start_datetime, end_datetime, party_size):
+        return self.get_queryset().with_free_tables_count(start_datetime, end_datetime, party_size)
+
     def catalog_filtration_related_data(self):
         return (
             self.get_queryset()
             .only(
                 'id',
                 'name',
+                'description',
+                'rating',
                 'address__name',
                 'address__settlement',
                 'address__settlement__region',
                 'address__settlement__region__country',
             )
             .visible_only()
-            .with_avg_rating()
             .with_location_data()
+            .with_cover_photo()
         )
 
     def main_info(self):
@@ -85,6 +188,7 @@ class CateringEstablishmentManager(models.Manager):
             .only(
                 'name',
                 'description',
+                'rating',
                 'address__name',
                 'address__settlement',
                 'address__settlement__region',
@@ -94,15 +198,14 @@ class CateringEstablishmentManager(models.Manager):
                 'address__settlement__region__country__name',
             )
             .with_photos()
-            .with_avg_rating()
             .with_location_data()
         )
 
     def with_tables_characteristics(self):
         return self.get_queryset().with_tables_characteristics()
 
-    def with_bookings_count(self):
-        return self.get_queryset().with_bookings_count()
+    def with_bookings_statistics(self, start_date, end_date):
+        return self.get_queryset().with_bookings_statistics(start_date, end_date)
 
 
 class CateringEstablishment(models.Model):
@@ -119,12 +222,51 @@ class CateringEstablishment(models.Model):
     last_payment_datetime = models.DateTimeField(null=True, blank=True)
     address = models.ForeignKey(Address, on_delete=models.PROTECT)
     work_hours = models.OneToOneField(WorkHours, on_delete=models.CASCADE, related_name='catering_establishment')
+    rating_sum = models.IntegerField(editable=False, default=0)
+    rating_count = models.IntegerField(editable=False, default=0)
+    rating = models.FloatField(editable=False, default=0, db_index=True)
+    search_vector = SearchVectorField(editable=False, null=True)
 
     objects = CateringEstablishmentManager()
 
     def __str__(self):
         return self.name
 
+    class Meta:
+        indexes = (
+            models.Index(fields=('name', 'id')),
+            models.Index(fields=('rating', 'id')),
+            GinIndex(fields=('search_vector',)),
+        )
+
+
+class CateringEstablishmentCatalogItem(models.Model):
+    """
+    Flat catalog row of a visible catering establishment.
+
+    Read-only projection backed by the `catering_establishment_catalog` materialized view.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=CATERING_ESTABLISHMENTS_NAME_MAX_LENGTH)
+    description = models.CharField(max_length=CUT_CATERING_ESTABLISHMENTS_DESCRIPTION_LENGTH)
+    photo = models.CharField(max_length=100, null=True)
+    rating = models.FloatField()
+    search_vector = SearchVectorField(null=True)
+    address_name = models.CharField(max_length=256)
+    work_hours_start_time = models.TimeField()
+    work_hours_end_time = models.TimeField()
+    settlement = models.ForeignKey(Settlement, on_delete=models.DO_NOTHING, related_name='+')
+    region = models.ForeignKey(Region, on_delete=models.DO_NOTHING, related_name='+')
+    country = models.ForeignKey(Country, on_delete=models.DO_NOTHING, related_name='+')
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        managed = False
+        db_table = 'catering_establishment_catalog'
+
 
 class CateringEstablishmentPhoto(models.Model):
     """
@@ -132,6 +274,7 @@ class CateringEstablishmentPhoto(models.Model):
     """
 
     photo = models.ImageField(upload_to='catering_establishment/photos/')
+    photo_hash = models.CharField(max_length=64, blank=True, editable=False)
     catering_establishment = models.ForeignKey(CateringEstablishment, on_delete=models.CASCADE, related_name='photos')
 
     def __str__(self):
@@ -150,6 +293,40 @@ class CateringEstablishmentRating(models.Model):
     def __str__(self):
         return f'{self.catering_establishment} - {self.visitor}'
 
+    def save(self, *args, **kwargs):
+        """
+        Save the rating and reflect it in the establishment rating aggregates within the same transaction.
+        """
+        with transaction.atomic():
+            previous_state = None
+            if self.pk:
+                previous_state = (
+                    CateringEstablishmentRating.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list('catering_establishment', 'rating')
+                    .first()
+                )
+            super().save(*args, **kwargs)
+
+            if previous_state is None:
+                CateringEstablishment.objects.filter(pk=self.catering_establishment_id).change_rating_aggregates(
+                    self.rating, 1
+                )
+                return
+
+            previous_catering_establishment, previous_rating = previous_state
+            if previous_catering_establishment == self.catering_establishment_id:
+                CateringEstablishment.objects.filter(pk=self.catering_establishment_id).change_rating_aggregates(
+                    self.rating - previous_rating, 0
+                )
+            else:
+                CateringEstablishment.objects.filter(pk=previous_catering_establishment).change_rating_aggregates(
+                    -previous_rating, -1
+                )
+                CateringEstablishment.objects.filter(pk=self.catering_establishment_id).change_rating_aggregates(
+                    self.rating, 1
+                )
+
     class Meta:
         unique_together = ('catering_establishment', 'visitor')
 
@@ -170,6 +347,9 @@ class CateringEstablishmentFeedback(TimeStampedModel):
     def __str__(self):
         return f'{self.catering_establishment} - {self.visitor}'
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = (models.Index(fields=('catering_establishment', 'created', 'id')),)
+
 
 class CateringEstablishmentTable(models.Model):
     """
@@ -184,6 +364,11 @@ class CateringEstablishmentTable(models.Model):
         return f'{self.catering_establishment}: {self.number}'
 
 
+class TsTzRange(Func):
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
+
 class BookingQuerySet(models.QuerySet):
     def with_activeness_status(self):
         return super().annotate(
@@ -204,6 +389,9 @@ class BookingQuerySet(models.QuerySet):
             )
         )
 
+    def with_catering_establishment_id(self):
+        return super().annotate(catering_establishment_id=F('catering_establishment_table__catering_establishment_id'))
+
 
 class BookingManager(models.Manager):
     def get_queryset(self):
@@ -226,12 +414,55 @@ class Booking(TimeRangedModel):
         on_delete=models.CASCADE,
         related_name='bookings',
     )
+    # Seats the table had when it was booked, counted as the guests of the booking in daily statistics.
+    guests_count = models.PositiveIntegerField(default=0, editable=False)
 
     objects = BookingManager()
 
     def __str__(self):
         return f'{self.catering_establishment_table.catering_establishment} - {self.client}'
 
+    class Meta:
+        indexes = (
+            models.Index(fields=('client', 'start_datetime', 'id')),
+            models.Index(fields=('catering_establishment_table', 'start_datetime', 'end_datetime')),
+        )
+        constraints = (
+            ExclusionConstraint(
+                name='exclude_overlapping_table_bookings',
+                expressions=(
+                    (TsTzRange('start_datetime', 'end_datetime', RangeBoundary()), RangeOperators.OVERLAPS),
+                    ('catering_establishment_table', RangeOperators.EQUAL),
+                ),
+            ),
+        )
+
+
+class DailyBookingStatistics(models.Model):
+    """
+    Bookings of a catering establishment started on one (local) day.
+
+    Bookings do not record a party size, so guests are counted as the seats the tables had when booked.
+    """
+
+    catering_establishment = models.ForeignKey(
+        CateringEstablishment,
+        on_delete=models.CASCADE,
+        related_name='daily_booking_statistics',
+    )
+    date = models.DateField()
+    bookings_count = models.IntegerField(default=0)
+    paid_bookings_count = models.IntegerField(default=0)
+    guests_count = models.IntegerField(default=0)
+
+    objects = DailyStatisticsManager(count_field='bookings_count')
+
+    def __str__(self):
+        return f'{self.catering_establishment} ({self.date})'
+
+    class Meta:
+        unique_together = ('catering_establishment', 'date')
+
 
 class BookingPayment(models.Model):
     booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name='booking_payment')
@@ -241,6 +472,9 @@ class BookingPayment(models.Model):
     def __str__(self):
         return f'{self.booking} ({self.datetime})'
 
+    class Meta:
+        indexes = (models.Index(fields=('datetime', 'booking')),)
+
 
 class BookingConditions(models.Model):
     id = models.CharField(max_length=12, primary_key=True, editable=False)
@@ -293,3 +527,6 @@ class CateringEstablishmentBalanceChange(models.Model):
 
     def __str__(self):
         return f'{self.catering_establishment} ({self.transaction_datetime})'
+
+    class Meta:
+        indexes = (models.Index(fields=('catering_establishment', 'transaction_datetime')),)
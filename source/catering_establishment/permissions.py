@@ -6,8 +6,10 @@ from catering_establishment.models import Booking, CateringEstablishment
 
 class IsCateringEstablishmentOwner(BasePermission):
     def has_permission(self, request, view):
-        catering_establishment = get_object_or_404(CateringEstablishment, pk=request.parser_context['kwargs']['pk'])
-        return catering_establishment.owner == request.user
+        catering_establishment = get_object_or_404(
+            CateringEstablishment.objects.only('owner'), pk=request.parser_context['kwargs']['pk']
+        )
+        return catering_establishment.owner_id == request.user.id
 
 
 class IsVisible(BasePermission):
@@ -1,16 +1,22 @@
-from django.db.models import prefetch_related_objects
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from catering_establishment import constants as ce_constants
 from catering_establishment import models as ce_models
 from common.constants import DATETIME_DESERIALIZATION_FORMAT
-from common.utils import build_absolute_url_to_media_file, save_base64_encoded_file
-from common.validators import validate_encoded_file
-from dish import constants as dish_constants
+from common.serializers import StatisticsPeriodSerializer
+from common.utils import build_absolute_url_to_media_file
+from dish.caches import menu_cache
 from dish.models import CateringEstablishmentDish, Discount
 from dish.serializers import CateringEstablishmentDishSerializer, OrderedDishWithFinalPriceSerializer
 from location.models import Address, Settlement
 from location.serializers import AddressSerializer
+from uploads.serializers import MediaField
+from uploads.services import release_image
 
 
 class CateringEstablishmentTableSerializer(serializers.ModelSerializer):
@@ -27,6 +33,7 @@ class CateringEstablishmentTableCharacteristicsSerializer(serializers.ModelSeria
 
 class CateringEstablishmentRepresentationSerializer(serializers.ModelSerializer):
     photo = serializers.ImageField()
+    image_variant = 'thumbnail'
 
     class Meta:
         model = ce_models.CateringEstablishment
@@ -37,8 +44,10 @@ class CateringEstablishmentRepresentationSerializer(serializers.ModelSerializer)
             'id': instance.id,
             'name': instance.name,
         }
-        if first_photo := instance.photos.all().first():
-            representation['photo'] = build_absolute_url_to_media_file(first_photo)
+        if instance.cover_photo:
+            representation['photo'] = build_absolute_url_to_media_file(
+                instance.cover_photo, self.context.get('image_variant', self.image_variant)
+            )
         return representation
 
 
@@ -52,7 +61,7 @@ class CateringEstablishmentSerializer(serializers.ModelSerializer):
     name = serializers.CharField(min_length=1, max_length=ce_constants.CATERING_ESTABLISHMENTS_NAME_MAX_LENGTH)
     address = AddressSerializer()
     work_hours = WorkHoursSerializer()
-    photos = serializers.ListField(child=serializers.CharField(validators=[validate_encoded_file]))
+    photos = serializers.ListField(child=MediaField())
     tables = serializers.ListField(child=CateringEstablishmentTableCharacteristicsSerializer())
     dishes = CateringEstablishmentDishSerializer(many=True)
 
@@ -60,6 +69,7 @@ class CateringEstablishmentSerializer(serializers.ModelSerializer):
         model = ce_models.CateringEstablishment
         fields = '__all__'
 
+    @transaction.atomic
     def create(self, validated_data):
         catering_establishment_data = self._get_catering_establishment_data(validated_data)
         catering_establishment_data['address'] = Address.objects.create(**validated_data['address'])
@@ -86,53 +96,65 @@ class CateringEstablishmentSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def create_catering_establishment_photos(photos_data, catering_establishment):
-        folder_media_path = f'{ce_constants.MEDIA_FOLDER_NAME}/{ce_constants.PHOTOS_FOLDER_NAME}'
-
+        photos = []
         for photo_data in photos_data:
-            file_path = save_base64_encoded_file(photo_data, folder_media_path)
-            ce_models.CateringEstablishmentPhoto.objects.create(
-                photo=file_path,
-                catering_establishment=catering_establishment,
+            photos.append(
+                ce_models.CateringEstablishmentPhoto(
+                    photo=photo_data.save(),
+                    photo_hash=photo_data.content_hash,
+                    catering_establishment=catering_establishment,
+                )
             )
+        ce_models.CateringEstablishmentPhoto.objects.bulk_create(photos)
 
     @staticmethod
     def create_tables(tables_data, catering_establishment):
-        for table_data in tables_data:
-            ce_models.CateringEstablishmentTable.objects.create(
-                catering_establishment=catering_establishment,
-                **table_data,
-            )
+        ce_models.CateringEstablishmentTable.objects.bulk_create(
+            [
+                ce_models.CateringEstablishmentTable(catering_establishment=catering_establishment, **table_data)
+                for table_data in tables_data
+            ]
+        )
 
     @staticmethod
     def create_dishes(dishes_data, catering_establishment):
-        folder_media_path = f'{dish_constants.MEDIA_FOLDER_NAME}/{dish_constants.PHOTOS_FOLDER_NAME}'
-
+        catering_establishment_dishes = []
         for dish_data in dishes_data:
-            file_path = save_base64_encoded_file(dish_data['photo'], folder_media_path)
-            catering_establishment_dish = CateringEstablishmentDish.objects.create(
-                catering_establishment=catering_establishment,
-                dish=dish_data['dish'],
-                photo=file_path,
-                description=dish_data['description'],
-                price=dish_data['price'],
-            )
-            if discount_data := dish_data.get('discount'):
-                Discount.objects.create(
-                    catering_establishment_dish=catering_establishment_dish,
-                    **discount_data,
+            catering_establishment_dishes.append(
+                CateringEstablishmentDish(
+                    catering_establishment=catering_establishment,
+                    dish=dish_data['dish'],
+                    photo=dish_data['photo'].save(),
+                    photo_hash=dish_data['photo'].content_hash,
+                    description=dish_data['description'],
+                    price=dish_data['price'],
                 )
+            )
+        CateringEstablishmentDish.objects.bulk_create(catering_establishment_dishes)
+        Discount.objects.bulk_create(
+            [
+                Discount(catering_establishment_dish=catering_establishment_dish, **dish_data['discount'])
+                for catering_establishment_dish, dish_data in zip(catering_establishment_dishes, dishes_data)
+                if dish_data.get('discount')
+            ]
+        )
+        # bulk_create bypasses the post_save handlers that maintain the search vector and the effective price.
+        created_dishes = CateringEstablishmentDish.objects.filter(
+            pk__in=[catering_establishment_dish.pk for catering_establishment_dish in catering_establishment_dishes]
+        )
+        created_dishes.update_search_vector()
+        created_dishes.update_effective_price()
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         catering_establishment_data = self._get_catering_establishment_data(validated_data)
         self.update_not_relational_catering_establishment_fields(instance, catering_establishment_data)
-        self.update_one_to_one_field(instance, 'address', validated_data['address'], Address)
-        self.update_one_to_one_field(instance, 'work_hours', validated_data['work_hours'], ce_models.WorkHours)
+        self.update_one_to_one_field(instance.address, validated_data['address'])
+        self.update_one_to_one_field(instance.work_hours, validated_data['work_hours'])
 
-        self.delete_catering_establishment_related_objects(instance)
-
-        self.create_catering_establishment_photos(validated_data['photos'], instance)
-        self.create_tables(validated_data['tables'], instance)
-        self.create_dishes(validated_data['dishes'], instance)
+        self.update_catering_establishment_photos(validated_data['photos'], instance)
+        self.update_tables(validated_data['tables'], instance)
+        self.update_dishes(validated_data['dishes'], instance)
 
         return instance
 
@@ -143,20 +165,172 @@ class CateringEstablishmentSerializer(serializers.ModelSerializer):
         instance.save()
 
     @staticmethod
-    def update_one_to_one_field(instance, relation_name, relation_data, relation_model):
-        old_field = getattr(instance, relation_name)
-        setattr(instance, relation_name, relation_model.objects.create(**relation_data))
-        instance.save()
-        old_field.delete()
+    def update_one_to_one_field(related_instance, relation_data):
+        changed_fields = [field for field, value in relation_data.items() if getattr(related_instance, field) != value]
+        for field in changed_fields:
+            setattr(related_instance, field, relation_data[field])
+        if changed_fields:
+            related_instance.save(update_fields=changed_fields)
+
+    @staticmethod
+    def update_catering_establishment_photos(photos_data, catering_establishment):
+        """
+        Keep the photos whose content is resent, store only the new ones and delete the rest.
+        """
+        existing_photos = defaultdict(list)
+        for existing_photo in catering_establishment.photos.all():
+            existing_photos[existing_photo.photo_hash].append(existing_photo)
+
+        new_photos = []
+        for photo_data in photos_data:
+            if existing_photos[photo_data.content_hash]:
+                existing_photos[photo_data.content_hash].pop()
+                continue
+            new_photos.append(
+                ce_models.CateringEstablishmentPhoto(
+                    photo=photo_data.save(),
+                    photo_hash=photo_data.content_hash,
+                    catering_establishment=catering_establishment,
+                )
+            )
+
+        ce_models.CateringEstablishmentPhoto.objects.bulk_create(new_photos)
+        ce_models.CateringEstablishmentPhoto.objects.filter(
+            pk__in=[stale_photo.pk for stale_photos in existing_photos.values() for stale_photo in stale_photos]
+        ).delete()
+
+    @classmethod
+    def update_tables(cls, tables_data, catering_establishment):
+        """
+        Match tables by their numbers, updating the changed ones, creating the new ones and deleting the rest.
+        """
+        existing_tables = {table.number: table for table in catering_establishment.tables.all()}
+
+        tables_to_update = []
+        new_tables_data = []
+        for table_data in tables_data:
+            table = existing_tables.pop(table_data['number'], None)
+            if table is None:
+                new_tables_data.append(table_data)
+            elif table.serving_clients_number != table_data['serving_clients_number']:
+                table.serving_clients_number = table_data['serving_clients_number']
+                tables_to_update.append(table)
+
+        ce_models.CateringEstablishmentTable.objects.bulk_update(tables_to_update, ('serving_clients_number',))
+        cls.create_tables(new_tables_data, catering_establishment)
+        ce_models.CateringEstablishmentTable.objects.filter(
+            pk__in=[table.pk for table in existing_tables.values()]
+        ).delete()
+
+    @classmethod
+    def update_dishes(cls, dishes_data, catering_establishment):
+        """
+        Match establishment dishes by their dishes and apply only the changes, so that the ordering history
+        of the kept dishes survives and their unchanged photos are not rewritten.
+        """
+        discount_fields = ('type', 'amount', 'start_datetime', 'end_datetime')
+        existing_dishes = {
+            catering_establishment_dish.dish_id: catering_establishment_dish
+            for catering_establishment_dish in catering_establishment.catering_establishment_dishes.select_related(
+                'discount'
+            )
+        }
+
+        new_dishes_data = []
+        dishes_to_update = []
+        updated_dishes_fields = set()
+        replaced_photos = []
+        discounts_to_create = []
+        discounts_to_update = []
+        discounts_to_delete = []
+        for dish_data in dishes_data:
+            catering_establishment_dish = existing_dishes.pop(dish_data['dish'].id, None)
+            if catering_establishment_dish is None:
+                new_dishes_data.append(dish_data)
+                continue
+
+            changed_fields = {
+                field
+                for field in ('description', 'price')
+                if getattr(catering_establishment_dish, field) != dish_data[field]
+            }
+            for field in changed_fields:
+                setattr(catering_establishment_dish, field, dish_data[field])
+            if dish_data['photo'].content_hash != catering_establishment_dish.photo_hash:
+                replaced_photos.append(catering_establishment_dish.photo.name)
+                catering_establishment_dish.photo = dish_data['photo'].save()
+                catering_establishment_dish.photo_hash = dish_data['photo'].content_hash
+                changed_fields |= {'photo', 'photo_hash'}
+            if changed_fields:
+                dishes_to_update.append(catering_establishment_dish)
+                updated_dishes_fields |= changed_fields
+
+            discount = getattr(catering_establishment_dish, 'discount', None)
+            discount_data = dish_data.get('discount')
+            if discount_data is None:
+                if discount is not None:
+                    discounts_to_delete.append(discount.pk)
+            elif discount is None:
+                discounts_to_create.append(
+                    Discount(catering_establishment_dish=catering_establishment_dish, **discount_data)
+                )
+            elif any(getattr(discount, field) != discount_data[field] for field in discount_fields):
+                for field in discount_fields:
+                    setattr(discount, field, discount_data[field])
+                discounts_to_update.append(discount)
+
+        if dishes_to_update:
+            CateringEstablishmentDish.objects.bulk_update(dishes_to_update, updated_dishes_fields)
+        Discount.objects.filter(pk__in=discounts_to_delete).delete()
+        Discount.objects.bulk_update(discounts_to_update, discount_fields)
+        Discount.objects.bulk_create(discounts_to_create)
+        cls.create_dishes(new_dishes_data, catering_establishment)
+        CateringEstablishmentDish.objects.filter(
+            pk__in=[catering_establishment_dish.pk for catering_establishment_dish in existing_dishes.values()]
+        ).delete()
+
+        if 'description' in updated_dishes_fields:
+            CateringEstablishmentDish.objects.filter(
+                pk__in=[catering_establishment_dish.pk for catering_establishment_dish in dishes_to_update]
+            ).update_search_vector()
+        repriced_dishes_ids = {discount.catering_establishment_dish_id for discount in discounts_to_update}
+        repriced_dishes_ids |= {discount.catering_establishment_dish_id for discount in discounts_to_create}
+        if 'price' in updated_dishes_fields:
+            repriced_dishes_ids |= {catering_establishment_dish.pk for catering_establishment_dish in dishes_to_update}
+        if repriced_dishes_ids:
+            CateringEstablishmentDish.objects.filter(pk__in=repriced_dishes_ids).update_effective_price()
+        # Bulk updates bypass the post_save handlers that invalidate the cached menu.
+        transaction.on_commit(lambda: menu_cache.bump_version(catering_establishment.pk))
+        for replaced_photo in replaced_photos:
+            release_image(replaced_photo)
 
     @staticmethod
-    def delete_catering_establishment_related_objects(instance):
-        ce_models.CateringEstablishmentPhoto.objects.filter(catering_establishment=instance).delete()
-        ce_models.CateringEstablishmentTable.objects.filter(catering_establishment=instance).delete()
-        CateringEstablishmentDish.objects.filter(catering_establishment=instance).delete()
+    def get_related_objects_lookups():
+        """
+        Prefetch lookups loading all related objects of the representation with one query per relation.
+        """
+        return (
+            'photos',
+            'tables',
+            Prefetch(
+                'catering_establishment_dishes',
+                queryset=CateringEstablishmentDish.objects.select_related('discount').only(
+                    'catering_establishment',
+                    'dish',
+                    'description',
+                    'photo',
+                    'price',
+                    'discount__type',
+                    'discount__amount',
+                    'discount__start_datetime',
+                    'discount__end_datetime',
+                ),
+            ),
+        )
 
     def to_representation(self, instance):
-        prefetch_related_objects((instance,), 'photos', 'tables', 'catering_establishment_dishes')
+        # Relations prefetched by the view are not fetched again.
+        prefetch_related_objects((instance,), *self.get_related_objects_lookups())
 
         return {
             'name': instance.name,
@@ -164,50 +338,34 @@ class CateringEstablishmentSerializer(serializers.ModelSerializer):
             'is_visible': instance.is_visible,
             'address': AddressSerializer(instance.address).data,
             'work_hours': WorkHoursSerializer(instance.work_hours).data,
-            'photos': self.get_photos_representation(instance),
-            'tables': instance.tables.all().values('number', 'serving_clients_number'),
-            'dishes': self.get_dishes_representation(instance),
+            'photos': [build_absolute_url_to_media_file(photo.photo.name) for photo in instance.photos.all()],
+            'tables': [
+                {'number': table.number, 'serving_clients_number': table.serving_clients_number}
+                for table in instance.tables.all()
+            ],
+            'dishes': [
+                self.get_dish_representation(catering_establishment_dish)
+                for catering_establishment_dish in instance.catering_establishment_dishes.all()
+            ],
             'enterprise_number': instance.enterprise_number,
         }
 
     @staticmethod
-    def get_address_representation(instance):
-        address_serializer = AddressSerializer(instance.address)
-        address_serializer.is_valid(raise_exception=True)
-        return address_serializer.data
-
-    @staticmethod
-    def get_photos_representation(instance):
-        raw_photos = instance.photos.all().values_list('photo', flat=True)
-        return list(map(lambda photo: build_absolute_url_to_media_file(photo), raw_photos))
-
-    @staticmethod
-    def get_dishes_representation(instance):
-        dishes_data = instance.catering_establishment_dishes.all().values(
-            'dish',
-            'description',
-            'photo',
-            'price',
-            'discount__type',
-            'discount__amount',
-            'discount__start_datetime',
-            'discount__end_datetime',
-        )
-
-        for data_item in dishes_data:
-            if data_item['discount__type']:
-                data_item['discount'] = {
-                    'type': data_item['discount__type'],
-                    'amount': data_item['discount__amount'],
-                    'start_datetime': data_item['discount__start_datetime'].strftime(DATETIME_DESERIALIZATION_FORMAT),
-                    'end_datetime': data_item['discount__end_datetime'].strftime(DATETIME_DESERIALIZATION_FORMAT),
-                }
-            del data_item['discount__type']
-            del data_item['discount__amount']
-            del data_item['discount__start_datetime']
-            del data_item['discount__end_datetime']
-            data_item['photo'] = build_absolute_url_to_media_file(data_item['photo'])
-        return dishes_data
+    def get_dish_representation(catering_establishment_dish):
+        representation = {
+            'dish': catering_establishment_dish.dish_id,
+            'description': catering_establishment_dish.description,
+            'photo': build_absolute_url_to_media_file(catering_establishment_dish.photo.name),
+            'price': catering_establishment_dish.price,
+        }
+        if discount := getattr(catering_establishment_dish, 'discount', None):
+            representation['discount'] = {
+                'type': discount.type,
+                'amount': discount.amount,
+                'start_datetime': discount.start_datetime.strftime(DATETIME_DESERIALIZATION_FORMAT),
+                'end_datetime': discount.end_datetime.strftime(DATETIME_DESERIALIZATION_FORMAT),
+            }
+        return representation
 
 
 class CateringEstablishmentCatalogItemSerializer(serializers.Serializer):
@@ -218,6 +376,7 @@ class CateringEstablishmentCatalogItemSerializer(serializers.Serializer):
     settlement = serializers.PrimaryKeyRelatedField(queryset=Settlement.objects.all())
     address = serializers.CharField(max_length=256)
     description = serializers.CharField(max_length=ce_constants.CUT_CATERING_ESTABLISHMENTS_DESCRIPTION_LENGTH)
+    image_variant = 'card'
 
     def to_representation(self, instance):
         representation = {
@@ -228,8 +387,34 @@ class CateringEstablishmentCatalogItemSerializer(serializers.Serializer):
             'address': instance.address.name,
             'description': instance.description[: ce_constants.CUT_CATERING_ESTABLISHMENTS_DESCRIPTION_LENGTH],
         }
-        if first_photo := instance.photos.all().first():
-            representation['photo'] = build_absolute_url_to_media_file(first_photo)
+        if instance.cover_photo:
+            representation['photo'] = build_absolute_url_to_media_file(
+                instance.cover_photo, self.context.get('image_variant', self.image_variant)
+            )
+
+        return representation
+
+
+class CateringEstablishmentCatalogProjectionItemSerializer(serializers.ModelSerializer):
+    image_variant = 'card'
+
+    class Meta:
+        model = ce_models.CateringEstablishmentCatalogItem
+        fields = ('id', 'name', 'photo', 'rating', 'settlement', 'address_name', 'description')
+
+    def to_representation(self, instance):
+        representation = {
+            'id': instance.id,
+            'name': instance.name,
+            'rating': instance.rating,
+            'settlement': instance.settlement_id,
+            'address': instance.address_name,
+            'description': instance.description,
+        }
+        if instance.photo:
+            representation['photo'] = build_absolute_url_to_media_file(
+                instance.photo, self.context.get('image_variant', self.image_variant)
+            )
 
         return representation
 
@@ -240,13 +425,18 @@ class CateringEstablishmentMainInfoSerializer(serializers.Serializer):
     rating = serializers.FloatField()
     photos = serializers.ListField(child=serializers.ImageField())
     address = serializers.CharField()
+    image_variant = 'full'
 
     def to_representation(self, instance):
+        image_variant = self.context.get('image_variant', self.image_variant)
         return {
             'name': instance.name,
             'description': instance.description,
             'rating': instance.rating,
-            'photos': map(build_absolute_url_to_media_file, instance.photos.values_list('photo', flat=True)),
+            'photos': [
+                build_absolute_url_to_media_file(photo, image_variant)
+                for photo in instance.photos.values_list('photo', flat=True)
+            ],
             'address': str(instance.address),
         }
 
@@ -276,13 +466,26 @@ class CateringEstablishmentFeedbackSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class BookingReadSerializer(serializers.ModelSerializer):
+class BookingPeriodValidationMixin:
+    """
+    Validate that a booking ends after it starts, taking the bound a partial update omits from the instance.
+    """
+
+    def validate(self, attrs):
+        start_datetime = attrs.get('start_datetime', getattr(self.instance, 'start_datetime', None))
+        end_datetime = attrs.get('end_datetime', getattr(self.instance, 'end_datetime', None))
+        if start_datetime >= end_datetime:
+            raise serializers.ValidationError(_('The booking must end after it starts.'))
+        return super().validate(attrs)
+
+
+class BookingReadSerializer(BookingPeriodValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = ce_models.Booking
         fields = ('id', 'catering_establishment_table', 'start_datetime', 'end_datetime')
 
 
-class BookingWriteSerializer(serializers.ModelSerializer):
+class BookingWriteSerializer(BookingPeriodValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = ce_models.Booking
         fields = '__all__'
@@ -298,21 +501,74 @@ class ExtendedBookingSerializer(BookingReadSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['catering_establishment'] = instance.catering_establishment_table.catering_establishment.id
+        representation['catering_establishment'] = instance.catering_establishment_id
         representation['is_active'] = instance.is_active
         representation['is_paid'] = instance.is_paid
         return representation
 
 
+class TablesAvailabilityQuerySerializer(serializers.Serializer):
+    catering_establishment = serializers.PrimaryKeyRelatedField(
+        queryset=ce_models.CateringEstablishment.objects.select_related('work_hours')
+    )
+    date = serializers.DateField()
+    party_size = serializers.IntegerField(min_value=1, default=1)
+
+
+class EstablishmentsAvailabilityQuerySerializer(serializers.Serializer):
+    id = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    datetime = serializers.DateTimeField()
+    party_size = serializers.IntegerField(min_value=1, default=1)
+    duration = serializers.IntegerField(min_value=1, default=ce_constants.DEFAULT_BOOKING_DURATION_MINUTES)
+
+
 class BookingPaymentSerializer(serializers.ModelSerializer):
     class Meta:
         model = ce_models.BookingPayment
         fields = '__all__'
 
 
+class DailyBookingStatisticsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ce_models.DailyBookingStatistics
+        fields = ('date', 'bookings_count', 'paid_bookings_count', 'guests_count')
+
+
 class EstablishmentBookingsCountSerializer(serializers.ModelSerializer):
     bookings_count = serializers.IntegerField()
+    paid_bookings_count = serializers.IntegerField()
+    guests_count = serializers.IntegerField()
+    days = DailyBookingStatisticsSerializer(source='period_statistics', many=True)
 
     class Meta:
         model = ce_models.CateringEstablishment
-        fields = ('name', 'bookings_count')
+        fields = ('name', 'bookings_count', 'paid_bookings_count', 'guests_count', 'days')
+
+
+class RevenueStatisticsQuerySerializer(StatisticsPeriodSerializer):
+    bucket = serializers.ChoiceField(choices=ce_constants.REVENUE_STATISTICS_BUCKETS, default='day')
+    catering_establishment = serializers.IntegerField(required=False)
+    moving_average_window = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        period_days = (attrs['end_date'] - attrs['start_date']).days + 1
+        if attrs['bucket'] == 'hour' and period_days > ce_constants.REVENUE_STATISTICS_HOURLY_MAX_DAYS:
+            raise serializers.ValidationError(
+                _('Hourly statistics are available for at most %(days)s days.')
+                % {'days': ce_constants.REVENUE_STATISTICS_HOURLY_MAX_DAYS}
+            )
+        return attrs
+
+
+class RevenueStatisticsSerializer(serializers.Serializer):
+    period = serializers.DateTimeField()
+    revenue = serializers.FloatField()
+    payments_count = serializers.IntegerField()
+    average_check = serializers.FloatField(allow_null=True)
+    bookings_count = serializers.IntegerField()
+    paid_bookings_count = serializers.IntegerField()
+    paid_bookings_ratio = serializers.FloatField(allow_null=True)
+    balance_change = serializers.FloatField()
+    owner_balance_change = serializers.FloatField()
+    revenue_moving_average = serializers.FloatField(required=False)
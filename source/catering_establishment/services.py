@@ -1,8 +1,28 @@
+import datetime
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Sum
+from django.db.models.functions import Trunc, TruncDate
+from django.utils import timezone
+from psycopg2 import errorcodes
+
+from catering_establishment import models as ce_models
 from catering_establishment import serializers as ce_serializers
+from catering_establishment.caches import catalog_cache
+from catering_establishment.exceptions import BookingConflict
+from catering_establishment.models import get_open_at_condition
+from common.statistics import moving_average
+from user.models import UserBalanceChange
 
+_catalog_projection_refresh_lock = threading.Lock()
+_catalog_projection_refresh_timer = None
 
-def create_catering_establishment_with_related_models(data):
-    serializer = ce_serializers.CateringEstablishmentSerializer(data=data)
+
+def create_catering_establishment_with_related_models(data, context=None):
+    serializer = ce_serializers.CateringEstablishmentSerializer(data=data, context=context or {})
     serializer.is_valid(raise_exception=True)
     return serializer.save()
 
@@ -10,10 +30,35 @@ def create_catering_establishment_with_related_models(data):
 def create_booking(data):
     serializer = ce_serializers.BookingWriteSerializer(data=data)
     serializer.is_valid(raise_exception=True)
-    serializer.save()
+    save_booking(serializer)
     return serializer.data
 
 
+def save_booking(serializer):
+    """
+    Save a booking, turning a violation of the non-overlapping bookings constraint into a conflict error.
+    """
+    try:
+        with transaction.atomic():
+            return serializer.save()
+    except IntegrityError as ex:
+        if getattr(ex.__cause__, 'pgcode', None) != errorcodes.EXCLUSION_VIOLATION:
+            raise
+        validated_data = serializer.validated_data
+        instance = serializer.instance
+        table = validated_data.get(
+            'catering_establishment_table', getattr(instance, 'catering_establishment_table', None)
+        )
+        raise BookingConflict(
+            find_nearest_free_slot(
+                table,
+                validated_data.get('start_datetime', getattr(instance, 'start_datetime', None)),
+                validated_data.get('end_datetime', getattr(instance, 'end_datetime', None)),
+                excluded_booking_id=getattr(instance, 'pk', None),
+            )
+        ) from ex
+
+
 def get_establishments_tables(queryset):
     return {
         establishment.id: (ce_serializers.CateringEstablishmentTableSerializer(establishment.tables, many=True).data)
@@ -26,3 +71,364 @@ def get_establishments_work_hours(queryset):
         work_hours.catering_establishment.id: (ce_serializers.WorkHoursSerializer(work_hours).data)
         for work_hours in queryset
     }
+
+
+def refresh_catalog_projection():
+    table_name = connection.ops.quote_name(ce_models.CateringEstablishmentCatalogItem._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {table_name}')
+    catalog_cache.bump_version()
+
+
+def schedule_catalog_projection_refresh():
+    """
+    Refresh the catalog projection CATALOG_PROJECTION_REFRESH_DELAY seconds after the first of a series of writes.
+
+    Writes arriving while a refresh is pending are coalesced into it.
+    """
+    global _catalog_projection_refresh_timer  # pylint: disable=global-statement
+
+    with _catalog_projection_refresh_lock:
+        if _catalog_projection_refresh_timer is not None:
+            return
+        _catalog_projection_refresh_timer = threading.Timer(
+            settings.CATALOG_PROJECTION_REFRESH_DELAY,
+            _refresh_scheduled_catalog_projection,
+        )
+        _catalog_projection_refresh_timer.daemon = True
+        _catalog_projection_refresh_timer.start()
+
+
+def _refresh_scheduled_catalog_projection():
+    global _catalog_projection_refresh_timer  # pylint: disable=global-statement
+
+    with _catalog_projection_refresh_lock:
+        _catalog_projection_refresh_timer = None
+    try:
+        refresh_catalog_projection()
+    finally:
+        connections.close_all()
+
+
+def get_work_period(work_hours, date):
+    """
+    Return the aware bounds of work hours started on the given date; hours ending at or before their start
+    last until the next day.
+    """
+    period_start = timezone.make_aware(datetime.datetime.combine(date, work_hours.start_time))
+    period_end = timezone.make_aware(datetime.datetime.combine(date, work_hours.end_time))
+    if period_end <= period_start:
+        period_end += datetime.timedelta(days=1)
+    return period_start, period_end
+
+
+def get_free_intervals(period_start, period_end, busy_intervals):
+    """
+    Sweep busy intervals sorted by their start and collect the gaps between them within the period.
+    """
+    free_intervals = []
+    cursor = period_start
+
+    for busy_start, busy_end in busy_intervals:
+        if busy_start > cursor:
+            free_intervals.append((cursor, min(busy_start, period_end)))
+        cursor = max(cursor, busy_end)
+        if cursor >= period_end:
+            break
+
+    if cursor < period_end:
+        free_intervals.append((cursor, period_end))
+    return free_intervals
+
+
+def get_tables_availability(catering_establishment, date, party_size):
+    period_start, period_end = get_work_period(catering_establishment.work_hours, date)
+    tables = catering_establishment.tables.filter(serving_clients_number__gte=party_size).order_by('number')
+
+    busy_intervals = defaultdict(list)
+    bookings = (
+        ce_models.Booking.objects.filter(
+            catering_establishment_table__in=tables,
+            start_datetime__lt=period_end,
+            end_datetime__gt=period_start,
+        )
+        .order_by('catering_establishment_table', 'start_datetime')
+        .values_list('catering_establishment_table', 'start_datetime', 'end_datetime')
+    )
+    for table_id, start_datetime, end_datetime in bookings:
+        busy_intervals[table_id].append((start_datetime, end_datetime))
+
+    return [
+        {
+            'table': table.id,
+            'number': table.number,
+            'serving_clients_number': table.serving_clients_number,
+            'free_intervals': [
+                {'start_datetime': start_datetime, 'end_datetime': end_datetime}
+                for start_datetime, end_datetime in get_free_intervals(
+                    period_start, period_end, busy_intervals[table.id]
+                )
+            ],
+        }
+        for table in tables
+    ]
+
+
+def find_nearest_free_slot(table, start_datetime, end_datetime, excluded_booking_id=None):
+    """
+    Find the free slot of the same duration on the table whose start is the closest to the requested one.
+
+    Work periods of the day before (for overnight hours), the requested day and the day after are searched.
+    """
+    duration = end_datetime - start_datetime
+    requested_date = timezone.localtime(start_datetime).date()
+    periods = [
+        get_work_period(table.catering_establishment.work_hours, requested_date + datetime.timedelta(days=offset))
+        for offset in (-1, 0, 1)
+    ]
+    busy_intervals = list(
+        ce_models.Booking.objects.filter(
+            catering_establishment_table=table,
+            start_datetime__lt=periods[-1][1],
+            end_datetime__gt=periods[0][0],
+        )
+        .exclude(pk=excluded_booking_id)
+        .order_by('start_datetime')
+        .values_list('start_datetime', 'end_datetime')
+    )
+
+    now = timezone.now()
+    nearest_slot_start = None
+    for period_start, period_end in periods:
+        for free_start, free_end in get_free_intervals(period_start, period_end, busy_intervals):
+            free_start = max(free_start, now)
+            if free_end - free_start < duration:
+                continue
+            slot_start = min(max(start_datetime, free_start), free_end - duration)
+            if nearest_slot_start is None or abs(slot_start - start_datetime) < abs(
+                nearest_slot_start - start_datetime
+            ):
+                nearest_slot_start = slot_start
+
+    if nearest_slot_start is None:
+        return None
+    return {'start_datetime': nearest_slot_start, 'end_datetime': nearest_slot_start + duration}
+
+
+def get_establishments_availability(establishments_ids, start_datetime, party_size, duration):
+    end_datetime = start_datetime + datetime.timedelta(minutes=duration)
+    queryset = (
+        ce_models.CateringEstablishment.objects.filter(id__in=establishments_ids)
+        .with_free_tables_count(start_datetime, end_datetime, party_size)
+        .annotate(
+            is_open=ExpressionWrapper(
+                get_open_at_condition(timezone.localtime(start_datetime).time()),
+                output_field=BooleanField(),
+            )
+        )
+        .values('id', 'is_open', 'free_tables_count')
+    )
+    return {
+        establishment['id']: {
+            'is_available': establishment['is_open'] and establishment['free_tables_count'] > 0,
+            'free_tables_count': establishment['free_tables_count'],
+        }
+        for establishment in queryset
+    }
+
+
+def get_booking_statistics_day(booking_id):
+    """
+    Return the catering establishment and the local date a booking is accounted to in daily statistics.
+    """
+    booking_data = (
+        ce_models.Booking.objects.filter(pk=booking_id)
+        .values_list('catering_establishment_table__catering_establishment', 'start_datetime')
+        .first()
+    )
+    if booking_data is None:
+        return None
+    catering_establishment_id, start_datetime = booking_data
+    return catering_establishment_id, timezone.localtime(start_datetime).date()
+
+
+def change_daily_booking_statistics(
+    catering_establishment_table_id, start_datetime, guests_count, sign=1, is_paid=False
+):
+    """
+    Add a booking of the table starting at the given time to the daily rollup, or subtract it when the sign is negative.
+    """
+    catering_establishment_id = (
+        ce_models.CateringEstablishmentTable.objects.filter(pk=catering_establishment_table_id)
+        .values_list('catering_establishment', flat=True)
+        .first()
+    )
+    if catering_establishment_id is None:
+        return
+    ce_models.DailyBookingStatistics.objects.change_counters(
+        {'catering_establishment_id': catering_establishment_id, 'date': timezone.localtime(start_datetime).date()},
+        bookings_count=sign,
+        paid_bookings_count=sign * is_paid,
+        guests_count=sign * guests_count,
+    )
+
+
+def change_daily_paid_bookings_statistics(booking_id, sign=1):
+    if statistics_day := get_booking_statistics_day(booking_id):
+        catering_establishment_id, date = statistics_day
+        ce_models.DailyBookingStatistics.objects.change_counters(
+            {'catering_establishment_id': catering_establishment_id, 'date': date},
+            paid_bookings_count=sign,
+        )
+
+
+def rebuild_daily_booking_statistics():
+    statistics = (
+        ce_models.Booking.objects.annotate(
+            catering_establishment=F('catering_establishment_table__catering_establishment'),
+            date=TruncDate('start_datetime'),
+        )
+        .order_by()
+        .values('catering_establishment', 'date')
+        .annotate(
+            bookings_count=Count('id'),
+            paid_bookings_count=Count('booking_payment'),
+            guests_count=Sum('guests_count'),
+        )
+    )
+    with transaction.atomic():
+        ce_models.DailyBookingStatistics.objects.all().delete()
+        ce_models.DailyBookingStatistics.objects.bulk_create(
+            (
+                ce_models.DailyBookingStatistics(
+                    catering_establishment_id=statistics_item.pop('catering_establishment'),
+                    **statistics_item,
+                )
+                for statistics_item in statistics.iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+def get_statistics_periods(start_date, end_date, bucket):
+    """
+    Return the starts of all periods of the given kind overlapping the local date range, in the current time zone.
+    """
+    if bucket == 'hour':
+        period_start = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time.min))
+        period_end = timezone.make_aware(
+            datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time.min)
+        )
+        # Hours are stepped in UTC so that daylight saving transitions neither skip nor repeat periods.
+        period_start, period_end = period_start.astimezone(datetime.timezone.utc), period_end.astimezone(
+            datetime.timezone.utc
+        )
+        periods = []
+        while period_start < period_end:
+            periods.append(timezone.localtime(period_start))
+            period_start += datetime.timedelta(hours=1)
+        return periods
+
+    if bucket == 'week':
+        start_date -= datetime.timedelta(days=start_date.weekday())
+    elif bucket == 'month':
+        start_date = start_date.replace(day=1)
+
+    dates = []
+    while start_date <= end_date:
+        dates.append(start_date)
+        if bucket == 'month':
+            start_date = (start_date + datetime.timedelta(days=32)).replace(day=1)
+        else:
+            start_date += datetime.timedelta(days=7 if bucket == 'week' else 1)
+    return [timezone.make_aware(datetime.datetime.combine(date, datetime.time.min)) for date in dates]
+
+
+def get_revenue_statistics(
+    owner, start_date, end_date, bucket, catering_establishment_id=None, moving_average_window=None
+):
+    """
+    Revenue, average check and paid bookings ratio of the owner's catering establishments bucketed by period.
+
+    Every source is grouped by date_trunc on the database side; the buckets are merged and completed with
+    empty periods here so that derived metrics like moving averages are computed over a continuous series.
+    """
+    period_start = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time.min))
+    period_end = timezone.make_aware(
+        datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time.min)
+    )
+    catering_establishments = ce_models.CateringEstablishment.objects.filter(owner=owner)
+    if catering_establishment_id is not None:
+        catering_establishments = catering_establishments.filter(pk=catering_establishment_id)
+
+    sources = (
+        ce_models.BookingPayment.objects.filter(
+            booking__catering_establishment_table__catering_establishment__in=catering_establishments.values('pk'),
+            datetime__gte=period_start,
+            datetime__lt=period_end,
+        )
+        .annotate(period=Trunc('datetime', bucket))
+        .values('period')
+        .annotate(revenue=Sum('amount'), payments_count=Count('id')),
+        ce_models.Booking.objects.filter(
+            catering_establishment_table__catering_establishment__in=catering_establishments.values('pk'),
+            start_datetime__gte=period_start,
+            start_datetime__lt=period_end,
+        )
+        .annotate(period=Trunc('start_datetime', bucket))
+        .values('period')
+        .annotate(bookings_count=Count('id'), paid_bookings_count=Count('booking_payment')),
+        ce_models.CateringEstablishmentBalanceChange.objects.filter(
+            catering_establishment__in=catering_establishments.values('pk'),
+            transaction_datetime__gte=period_start,
+            transaction_datetime__lt=period_end,
+        )
+        .annotate(period=Trunc('transaction_datetime', bucket))
+        .values('period')
+        .annotate(balance_change=Sum('amount')),
+        UserBalanceChange.objects.filter(
+            user=owner,
+            transaction_datetime__gte=period_start,
+            transaction_datetime__lt=period_end,
+        )
+        .annotate(period=Trunc('transaction_datetime', bucket))
+        .values('period')
+        .annotate(owner_balance_change=Sum('amount')),
+    )
+
+    periods_statistics = {
+        period: {
+            'period': period,
+            'revenue': 0.0,
+            'payments_count': 0,
+            'bookings_count': 0,
+            'paid_bookings_count': 0,
+            'balance_change': 0.0,
+            'owner_balance_change': 0.0,
+        }
+        for period in get_statistics_periods(start_date, end_date, bucket)
+    }
+    for source in sources:
+        for source_statistics in source.order_by():
+            periods_statistics[source_statistics.pop('period')].update(source_statistics)
+
+    statistics = list(periods_statistics.values())
+    for period_statistics in statistics:
+        period_statistics['average_check'] = (
+            period_statistics['revenue'] / period_statistics['payments_count']
+            if period_statistics['payments_count']
+            else None
+        )
+        period_statistics['paid_bookings_ratio'] = (
+            period_statistics['paid_bookings_count'] / period_statistics['bookings_count']
+            if period_statistics['bookings_count']
+            else None
+        )
+
+    if moving_average_window:
+        revenue_moving_averages = moving_average(
+            [period_statistics['revenue'] for period_statistics in statistics], moving_average_window
+        )
+        for period_statistics, revenue_moving_average in zip(statistics, revenue_moving_averages):
+            period_statistics['revenue_moving_average'] = revenue_moving_average
+    return statistics
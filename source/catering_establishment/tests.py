@@ -0,0 +1,72 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from catering_establishment import models as ce_models
+from catering_establishment.views import CateringEstablishmentViewSet
+from dish import models as dish_models
+from location.models import Address, Country, Region, Settlement
+
+
+class CateringEstablishmentUpdateInfoTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = get_user_model().objects.create_user(username='owner', password='password')
+        settlement = Settlement.objects.create(
+            name='settlement',
+            region=Region.objects.create(name='region', country=Country.objects.create(name='country')),
+        )
+        cls.catering_establishment = ce_models.CateringEstablishment.objects.create(
+            owner=cls.owner,
+            name='name',
+            description='description',
+            address=Address.objects.create(name='address', settlement=settlement),
+            work_hours=ce_models.WorkHours.objects.create(start_time='09:00', end_time='22:00'),
+        )
+        for number in range(3):
+            ce_models.CateringEstablishmentPhoto.objects.create(
+                catering_establishment=cls.catering_establishment, photo=f'catering_establishment/photos/{number}.webp'
+            )
+            ce_models.CateringEstablishmentTable.objects.create(
+                catering_establishment=cls.catering_establishment, number=number, serving_clients_number=4
+            )
+
+        subcategory = dish_models.DishSubcategory.objects.create(
+            name='subcategory', category=dish_models.DishCategory.objects.create(name='category')
+        )
+        food = dish_models.Food.objects.create(name='food')
+        now = timezone.now()
+        for number in range(6):
+            catering_establishment_dish = dish_models.CateringEstablishmentDish.objects.create(
+                catering_establishment=cls.catering_establishment,
+                dish=dish_models.Dish.objects.create(name=f'dish {number}', food=food, subcategory=subcategory),
+                description='description',
+                photo=f'dish/photos/{number}.webp',
+                price=10 + number,
+            )
+            if number % 2:
+                dish_models.Discount.objects.create(
+                    catering_establishment_dish=catering_establishment_dish,
+                    type=dish_models.Discount.PERCENT,
+                    amount=10,
+                    start_datetime=now - datetime.timedelta(days=1),
+                    end_datetime=now + datetime.timedelta(days=1),
+                )
+
+    def test_retrieve_update_info_query_count_does_not_depend_on_dishes_count(self):
+        view = CateringEstablishmentViewSet.as_view({'get': 'retrieve_update_info'})
+        request = APIRequestFactory().get(f'/catering_establishment/{self.catering_establishment.pk}/update_info/')
+        force_authenticate(request, self.owner)
+
+        # The owner check, the establishment with its address and work hours, photos, tables and dishes.
+        with self.assertNumQueries(5):
+            response = view(request, pk=self.catering_establishment.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['photos']), 3)
+        self.assertEqual(len(response.data['tables']), 3)
+        self.assertEqual(len(response.data['dishes']), 6)
+        self.assertEqual(sum('discount' in dish for dish in response.data['dishes']), 3)
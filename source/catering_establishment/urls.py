@@ -19,10 +19,13 @@ urlpatterns = (
         path('feedbacks/', views.CateringEstablishmentFeedbacksView.as_view()),
         path('tables_list/', views.CateringEstablishmentTablesListView.as_view()),
         path('tables/', views.CateringEstablishmentsTablesView.as_view()),
+        path('tables_availability/', views.CateringEstablishmentTablesAvailabilityView.as_view()),
+        path('availability/', views.CateringEstablishmentsAvailabilityView.as_view()),
         path('work_hours/', views.CateringEstablishmentWorkHoursView.as_view()),
         path('representation/', views.CateringEstablishmentsRepresentationView.as_view()),
         path('pay_for_booking/', views.BookingPaymentCreateView.as_view()),
         path('bookings_statistics/', views.BookingsStatisticsView.as_view()),
+        path('revenue_statistics/', views.RevenueStatisticsView.as_view()),
     ]
     + non_root_router.urls
     + root_router.urls
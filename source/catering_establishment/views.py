@@ -1,11 +1,13 @@
 """
 Catering establishment views.
 """
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework.decorators import action
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import CreateAPIView, ListAPIView, ListCreateAPIView
 from rest_framework.mixins import CreateModelMixin, ListModelMixin, RetrieveModelMixin, UpdateModelMixin
 from rest_framework.permissions import IsAuthenticated
@@ -14,16 +16,25 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
 from catering_establishment import filters
+from catering_establishment.caches import catalog_cache
 from catering_establishment import models as ce_models
 from catering_establishment.permissions import IsBookingAuthor, IsCateringEstablishmentOwner, IsVisible
 from catering_establishment import serializers
 from catering_establishment.services import (
     create_booking,
     create_catering_establishment_with_related_models,
+    get_establishments_availability,
     get_establishments_tables,
     get_establishments_work_hours,
+    get_revenue_statistics,
+    get_tables_availability,
+    save_booking,
 )
-from dish.models import CateringEstablishmentDish
+from common.filters import FullTextSearchFilter
+from common.mixins import CachedListMixin, StreamingListMixin
+from common.pagination import OptionalPageNumberPagination
+from common.serializers import StatisticsPeriodSerializer
+from dish.models import CateringEstablishmentDish, OrderedDish
 
 
 class CateringEstablishmentViewSet(CreateModelMixin, RetrieveModelMixin, UpdateModelMixin, GenericViewSet):
@@ -31,7 +42,7 @@ class CateringEstablishmentViewSet(CreateModelMixin, RetrieveModelMixin, UpdateM
     def create_new(self, request, *args, **kwargs):
         data = request.data
         data['owner'] = request.user.id
-        catering_establishment = create_catering_establishment_with_related_models(data)
+        catering_establishment = create_catering_establishment_with_related_models(data, self.get_serializer_context())
         return Response({'id': catering_establishment.id})
 
     @action(detail=True, url_path='update_info')
@@ -59,6 +70,10 @@ class CateringEstablishmentViewSet(CreateModelMixin, RetrieveModelMixin, UpdateM
     def get_queryset(self):
         if self.action == 'retrieve_main_info':
             return ce_models.CateringEstablishment.objects.main_info()
+        if self.action in ('retrieve_update_info', 'update', 'partial_update'):
+            return ce_models.CateringEstablishment.objects.select_related('address', 'work_hours').prefetch_related(
+                *serializers.CateringEstablishmentSerializer.get_related_objects_lookups()
+            )
         return ce_models.CateringEstablishment.objects.all()
 
 
@@ -67,22 +82,22 @@ class UserCateringEstablishmentsView(ListAPIView):
     serializer_class = serializers.CateringEstablishmentRepresentationSerializer
 
     def get_queryset(self):
-        return ce_models.CateringEstablishment.objects.filter(owner=self.request.user)
+        return ce_models.CateringEstablishment.objects.with_cover_photo().filter(owner=self.request.user)
 
 
-class CateringEstablishmentsRepresentationView(ListAPIView):
+class CateringEstablishmentsRepresentationView(StreamingListMixin, ListAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.CateringEstablishmentRepresentationSerializer
     pagination_class = None
 
     def get_queryset(self):
-        queryset = ce_models.CateringEstablishment.objects.all()
+        queryset = ce_models.CateringEstablishment.objects.with_cover_photo()
         if establishments_ids := self.request.query_params.getlist('id'):
             queryset = queryset.filter(id__in=establishments_ids)
         return queryset
 
 
-class CateringEstablishmentTablesListView(ListAPIView):
+class CateringEstablishmentTablesListView(StreamingListMixin, ListAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.CateringEstablishmentTableSerializer
     pagination_class = None
@@ -103,6 +118,27 @@ class CateringEstablishmentsTablesView(APIView):
         return Response(get_establishments_tables(queryset))
 
 
+class CateringEstablishmentTablesAvailabilityView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        serializer = serializers.TablesAvailabilityQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(get_tables_availability(**serializer.validated_data))
+
+
+class CateringEstablishmentsAvailabilityView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        serializer = serializers.EstablishmentsAvailabilityQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        return Response(
+            get_establishments_availability(data['id'], data['datetime'], data['party_size'], data['duration'])
+        )
+
+
 class CateringEstablishmentWorkHoursView(APIView):
     permission_classes = (IsAuthenticated,)
 
@@ -111,14 +147,38 @@ class CateringEstablishmentWorkHoursView(APIView):
         return Response(get_establishments_work_hours(queryset))
 
 
-class CateringEstablishmentCatalogView(ListAPIView):
+class CateringEstablishmentCatalogView(CachedListMixin, ListAPIView):
     permission_classes = (IsAuthenticated,)
-    serializer_class = serializers.CateringEstablishmentCatalogItemSerializer
-    queryset = ce_models.CateringEstablishment.objects.catalog_filtration_related_data()
-    filter_backends = (DjangoFilterBackend, OrderingFilter, SearchFilter)
-    search_fields = ('name',)
+    response_cache = catalog_cache
+    filter_backends = (DjangoFilterBackend, OrderingFilter, FullTextSearchFilter)
     ordering_fields = ('name', 'rating')
-    filterset_class = filters.CateringEstablishmentCatalogFilter
+
+    @property
+    def filterset_class(self):
+        if settings.CATALOG_PROJECTION_ENABLED:
+            return filters.CateringEstablishmentCatalogProjectionFilter
+        return filters.CateringEstablishmentCatalogFilter
+
+    def is_response_cacheable(self, request):
+        # Availability changes with every booking, so it is always checked against the database.
+        return not request.query_params.get('available_at')
+
+    def get_response_cache_key(self, request):
+        cache_key = super().get_response_cache_key(request)
+        if request.query_params.get('open_now'):
+            # Opening status changes with time, so such responses are only reused within the same minute.
+            cache_key = f"{cache_key}#{timezone.localtime().strftime('%H:%M')}"
+        return cache_key
+
+    def get_queryset(self):
+        if settings.CATALOG_PROJECTION_ENABLED:
+            return ce_models.CateringEstablishmentCatalogItem.objects.defer('search_vector')
+        return ce_models.CateringEstablishment.objects.catalog_filtration_related_data()
+
+    def get_serializer_class(self):
+        if settings.CATALOG_PROJECTION_ENABLED:
+            return serializers.CateringEstablishmentCatalogProjectionItemSerializer
+        return serializers.CateringEstablishmentCatalogItemSerializer
 
 
 class CateringEstablishmentUserRatingView(APIView):
@@ -150,10 +210,8 @@ class CateringEstablishmentUserRatingView(APIView):
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        avg_rating = (
-            ce_models.CateringEstablishment.objects.with_avg_rating()
-            .get(id=serializer.validated_data['catering_establishment'].id)
-            .rating
+        avg_rating = ce_models.CateringEstablishment.objects.values_list('rating', flat=True).get(
+            id=serializer.validated_data['catering_establishment'].id
         )
         return Response({'avg_rating': avg_rating})
 
@@ -178,11 +236,11 @@ class CateringEstablishmentFeedbacksView(ListCreateAPIView):
         return super().get_serializer(*args, **kwargs)
 
 
-class BookingViewSet(CreateModelMixin, UpdateModelMixin, ListModelMixin, GenericViewSet):
+class BookingViewSet(StreamingListMixin, CreateModelMixin, UpdateModelMixin, ListModelMixin, GenericViewSet):
     permission_classes = (IsAuthenticated,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = filters.BookingFilter
-    pagination_class = None
+    pagination_class = OptionalPageNumberPagination
 
     def get_queryset(self):
         if self.action == 'list_owned_by_user':
@@ -190,13 +248,18 @@ class BookingViewSet(CreateModelMixin, UpdateModelMixin, ListModelMixin, Generic
                 ce_models.Booking.objects.filter(client=self.request.user)
                 .with_activeness_status()
                 .with_payment_status()
+                .order_by('-start_datetime')
             )
             if self.request.query_params.get('extended') == 'true':
-                queryset = queryset.prefetch_related(
+                queryset = queryset.with_catering_establishment_id().prefetch_related(
+                    Prefetch(
+                        'ordered_dishes',
+                        queryset=OrderedDish.objects.only('id', 'weight', 'booking', 'catering_establishment_dish'),
+                    ),
                     Prefetch(
                         'ordered_dishes__catering_establishment_dish',
-                        queryset=CateringEstablishmentDish.objects.with_final_price(),
-                    )
+                        queryset=CateringEstablishmentDish.objects.only('id', 'dish', 'price').with_final_price(),
+                    ),
                 )
             return queryset
         return ce_models.Booking.objects.all()
@@ -218,6 +281,9 @@ class BookingViewSet(CreateModelMixin, UpdateModelMixin, ListModelMixin, Generic
         request.data['client'] = request.user.id
         return super().partial_update(request, *args, **kwargs)
 
+    def perform_update(self, serializer):
+        save_booking(serializer)
+
     @action(detail=False, url_path='owned_by_user')
     def list_owned_by_user(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
@@ -228,18 +294,54 @@ class BookingPaymentCreateView(CreateAPIView):
     serializer_class = serializers.BookingPaymentSerializer
 
 
-class BookingsStatisticsView(ListAPIView):
+class BookingsStatisticsView(StreamingListMixin, ListAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.EstablishmentBookingsCountSerializer
     pagination_class = None
 
     def get_queryset(self):
+        period_serializer = StatisticsPeriodSerializer(data=self.request.query_params)
+        period_serializer.is_valid(raise_exception=True)
+        start_date, end_date = (
+            period_serializer.validated_data['start_date'],
+            period_serializer.validated_data['end_date'],
+        )
+
         return (
-            ce_models.CateringEstablishment.objects.filter(
-                owner=self.request.user,
-                tables__bookings__start_datetime__gte=self.request.query_params.get('start_date'),
-                tables__bookings__end_datetime__lte=self.request.query_params.get('end_date'),
+            ce_models.CateringEstablishment.objects.filter(owner=self.request.user)
+            .only('name')
+            .with_bookings_statistics(start_date, end_date)
+            .filter(bookings_count__gt=0)
+            .prefetch_related(
+                Prefetch(
+                    'daily_booking_statistics',
+                    queryset=ce_models.DailyBookingStatistics.objects.filter(
+                        date__range=(start_date, end_date)
+                    ).order_by('date'),
+                    to_attr='period_statistics',
+                )
             )
-            .with_bookings_count()
             .order_by('-bookings_count')
         )
+
+
+class RevenueStatisticsView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        query_serializer = serializers.RevenueStatisticsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        return Response(
+            serializers.RevenueStatisticsSerializer(
+                get_revenue_statistics(
+                    request.user,
+                    query['start_date'],
+                    query['end_date'],
+                    query['bucket'],
+                    query.get('catering_establishment'),
+                    query.get('moving_average_window'),
+                ),
+                many=True,
+            ).data
+        )
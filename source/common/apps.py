@@ -11,3 +11,7 @@ class CommonConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'common'
+
+    def ready(self):
+        import common.checks  # noqa: F401
+        import common.lookups  # noqa: F401
@@ -0,0 +1,79 @@
+"""
+Versioned caching on top of the Django cache framework.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+class VersionedCache:
+    """
+    A cache namespace whose entries are keyed by a version counter.
+
+    Bumping the version of a scope retires all entries stored under it at once; stale entries are never
+    read again and simply expire. Versions and hit and miss counters are kept in the default cache, so
+    bumps and figures are only seen by all processes when its backend is shared between them, which the
+    `common.E001` check requires outside of debug mode.
+    """
+
+    registry = {}
+
+    def __init__(self, namespace, timeout=None):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.registry[namespace] = self
+
+    def build_key(self, *parts):
+        return ':'.join((self.namespace, *map(str, parts)))
+
+    def get_version(self, scope=''):
+        version_key = self.build_key('version', scope)
+        if (version := cache.get(version_key)) is None:
+            # Versions start from a timestamp, so an evicted counter never falls back to an already used value.
+            cache.add(version_key, time.time_ns(), timeout=None)
+            version = cache.get(version_key)
+        return version
+
+    def bump_version(self, scope=''):
+        try:
+            cache.incr(self.build_key('version', scope))
+        except ValueError:
+            self.get_version(scope)
+
+    def build_entry_key(self, key, scope='', version=None):
+        key_hash = hashlib.sha256(str(key).encode()).hexdigest()
+        return self.build_key('entry', scope, version or self.get_version(scope), key_hash)
+
+    def get(self, key, scope='', version=None):
+        value = cache.get(self.build_entry_key(key, scope, version))
+        self.increment_counter('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value, scope='', version=None):
+        """
+        Store a value under the current version or, when given, under the version read before the value was built,
+        so that a value built concurrently with a bump is never stored under the new version.
+        """
+        cache.set(self.build_entry_key(key, scope, version), value, self.timeout)
+
+    def increment_counter(self, counter_name):
+        counter_key = self.build_key('statistics', counter_name)
+        cache.add(counter_key, 0, timeout=None)
+        try:
+            cache.incr(counter_key)
+        except ValueError:
+            pass
+
+    def get_statistics(self):
+        hits = cache.get(self.build_key('statistics', 'hits'), 0)
+        misses = cache.get(self.build_key('statistics', 'misses'), 0)
+        requests_count = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / requests_count if requests_count else 0.0,
+        }
+
+    def reset_statistics(self):
+        cache.delete_many([self.build_key('statistics', 'hits'), self.build_key('statistics', 'misses')])
@@ -0,0 +1,31 @@
+"""
+System checks of the project configuration.
+"""
+from django.conf import settings
+from django.core import checks
+
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache_backend(app_configs, **kwargs):
+    """
+    Versioned caches are invalidated by bumping counters in the default cache, which only works when every process
+    reads the same counters.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        checks.Error(
+            f'The default cache backend {backend} is not shared between processes.',
+            hint=(
+                'Set DJANGO_CACHE_BACKEND and DJANGO_CACHE_LOCATION to a shared cache, '
+                'e.g. django.core.cache.backends.redis.RedisCache and redis://redis:6379/0.'
+            ),
+            id='common.E001',
+        )
+    ]
@@ -1,3 +1,12 @@
 BASE64_METADATA_REGEXP = r'data:\w+/(\w+);base64'
 BASE64_ENCODED_FILE_REGEXP = rf'^{BASE64_METADATA_REGEXP},.*$'
 DATETIME_DESERIALIZATION_FORMAT = '%Y-%m-%dT%H:%M'
+FULL_TEXT_SEARCH_CONFIG = 'simple'
+STREAMING_RESPONSE_CHUNK_SIZE = 500
+IMAGE_VARIANTS_SIZES = {
+    'thumbnail': (320, 320),
+    'card': (800, 800),
+    'full': (1920, 1920),
+}
+MAIN_IMAGE_VARIANT = 'full'
+PROCESSED_IMAGE_EXTENSION = 'webp'
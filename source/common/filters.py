@@ -1,5 +1,44 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
 from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from common.constants import FULL_TEXT_SEARCH_CONFIG
 
 
 class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
     pass
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Search backend that matches terms as prefixes against a stored, GIN-indexed `tsvector` column.
+
+    A view may set `search_vector_field` to point at another column. Results are ranked by relevance
+    unless the client asks for an explicit ordering.
+    """
+
+    search_vector_field = 'search_vector'
+    search_rank_annotation = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        words = [word for term in self.get_search_terms(request) for word in re.findall(r'\w+', term)]
+        if not words:
+            return queryset
+
+        search_query = SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            search_type='raw',
+            config=FULL_TEXT_SEARCH_CONFIG,
+        )
+        search_vector_field = getattr(view, 'search_vector_field', self.search_vector_field)
+        queryset = queryset.filter(**{search_vector_field: search_query}).annotate(
+            **{self.search_rank_annotation: SearchRank(F(search_vector_field), search_query)}
+        )
+
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by(f'-{self.search_rank_annotation}', *queryset.query.order_by)
+        return queryset
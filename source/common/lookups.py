@@ -0,0 +1,16 @@
+from django.db import models
+from django.db.models.lookups import IContains
+
+
+@models.CharField.register_lookup
+class TrigramIContains(IContains):
+    """
+    Case-insensitive substring lookup rendered as a bare `ILIKE`, so a `gin_trgm_ops` index on the column applies.
+
+    The built-in `icontains` wraps both sides in `UPPER()`, which hides the column from trigram indexes.
+    """
+
+    lookup_name = 'trigram_icontains'
+
+    def get_rhs_op(self, connection, rhs):
+        return f'ILIKE {rhs}'
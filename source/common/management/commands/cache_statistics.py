@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+
+from common.cache import VersionedCache
+
+
+class Command(BaseCommand):
+    help = 'Report hit and miss counts of the versioned response caches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after reporting them.')
+
+    def handle(self, *args, **options):
+        autodiscover_modules('caches')
+
+        for namespace, versioned_cache in sorted(VersionedCache.registry.items()):
+            statistics = versioned_cache.get_statistics()
+            self.stdout.write(
+                f"{namespace}: {statistics['hits']} hits, {statistics['misses']} misses, "
+                f"hit ratio {statistics['hit_ratio']:.2%}"
+            )
+            if options['reset']:
+                versioned_cache.reset_statistics()
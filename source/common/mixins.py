@@ -0,0 +1,72 @@
+from urllib.parse import urlencode
+
+from django.db.models import QuerySet
+from rest_framework.response import Response
+
+from common.constants import STREAMING_RESPONSE_CHUNK_SIZE
+from common.responses import StreamingJSONArrayResponse
+
+
+class CachedListMixin:
+    """
+    Serve list responses from a versioned cache keyed by the normalized query string.
+
+    Views define `response_cache` (a `common.cache.VersionedCache`) and may override
+    `get_response_cache_scope` to key entries by a narrower version counter and `is_response_cacheable`
+    to serve requests whose results change too often to be cached from the database.
+    """
+
+    response_cache = None
+    cache_status_header = 'X-Cache'
+
+    def get_response_cache_scope(self):
+        return ''
+
+    def is_response_cacheable(self, request):
+        return True
+
+    def get_response_cache_key(self, request):
+        params = sorted((key, value) for key, values in request.query_params.lists() for value in values if value != '')
+        return f'{request.get_host()}{request.path}?{urlencode(params)}'
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return super().list(request, *args, **kwargs)
+
+        cache_key = self.get_response_cache_key(request)
+        scope = self.get_response_cache_scope()
+        # The version is read once, so that a response built concurrently with a bump is stored under the old one.
+        version = self.response_cache.get_version(scope)
+        if (data := self.response_cache.get(cache_key, scope, version)) is not None:
+            return Response(data, headers={self.cache_status_header: 'HIT'})
+
+        response = super().list(request, *args, **kwargs)
+        self.response_cache.set(cache_key, response.data, scope, version)
+        response[self.cache_status_header] = 'MISS'
+        return response
+
+
+class StreamingListMixin:
+    """
+    Stream unpaginated list responses instead of serializing the whole list in memory.
+
+    The queryset is iterated with a server-side cursor in chunks of `stream_chunk_size` rows and every item
+    is rendered as soon as it is fetched. Paginated and non-JSON (e.g. browsable API) responses are built as usual.
+    """
+
+    stream_chunk_size = STREAMING_RESPONSE_CHUNK_SIZE
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        if request.accepted_renderer.format != 'json':
+            return Response(serializer.data)
+        if isinstance(queryset, QuerySet):
+            queryset = queryset.iterator(chunk_size=self.stream_chunk_size)
+        return StreamingJSONArrayResponse(serializer.child.to_representation(instance) for instance in queryset)
@@ -1,7 +1,8 @@
 """
 Models used in different project applications.
 """
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 
 
 class TimeRangedModel(models.Model):
@@ -14,3 +15,37 @@ class TimeRangedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class DailyStatisticsManager(models.Manager):
+    """
+    A manager of daily rollup rows that are kept up to date by adding the changes of the counted objects.
+
+    A row is deleted once its count field drops to zero.
+    """
+
+    def __init__(self, count_field):
+        super().__init__()
+        self.count_field = count_field
+
+    def change_counters(self, key, **deltas):
+        """
+        Add the deltas to the counters of the row identified by the key fields, creating the row if there is none.
+
+        Counters are changed with F() expressions, so concurrent changes of a row add up instead of overwriting each
+        other. When two transactions create the same row, the unique constraint makes the later one fail inside its
+        savepoint, and its deltas are added to the row created by the other one.
+        """
+        statistics = self.filter(**key)
+        counters = {field: F(field) + delta for field, delta in deltas.items()}
+        if not statistics.update(**counters):
+            if deltas.get(self.count_field, 0) <= 0:
+                return
+            try:
+                with transaction.atomic():
+                    self.create(**key, **deltas)
+                return
+            except IntegrityError:
+                statistics.update(**counters)
+        if deltas.get(self.count_field, 0) < 0:
+            statistics.filter(**{self.count_field: 0}).delete()
@@ -1,7 +1,146 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
 from rest_framework.pagination import PageNumberPagination as DrfPageNumberPagination
+from rest_framework.pagination import _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks to the next page by the values of the active ordering fields.
+
+    The ordering already applied to the queryset (by OrderingFilter or the view itself) is completed with
+    the primary key as a tiebreaker, so every page costs one indexed range scan regardless of its depth.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 40
+    max_page_size = 50
+    tiebreaker_field = 'id'
+    invalid_cursor_message = _('Invalid cursor.')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+        if encoded_cursor := request.query_params.get(self.cursor_query_param):
+            queryset = queryset.filter(self.get_keyset_condition(self.decode_cursor(encoded_cursor)))
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([('next', self.get_next_link()), ('results', data)]))
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, queryset):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str) and field != '?']
+        ordering = ordering or list(queryset.model._meta.ordering)
+
+        if not any(field.lstrip('-') in (self.tiebreaker_field, 'pk') for field in ordering):
+            # The tiebreaker follows the direction of the last field so that a single index serves the ordering.
+            direction = '-' if ordering and ordering[-1].startswith('-') else ''
+            ordering.append(f'{direction}{self.tiebreaker_field}')
+        return ordering
+
+    def get_keyset_condition(self, position):
+        leading_field, leading_value = self.ordering[0], position[0]
+        leading_lookup = 'lte' if leading_field.startswith('-') else 'gte'
+        # The redundant bound on the leading field lets the database seek in the index instead of filtering.
+        bound = Q(**{f'{leading_field.lstrip("-")}__{leading_lookup}': leading_value})
+
+        condition = Q()
+        equality = Q()
+        for field, value in zip(self.ordering, position):
+            field_name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equality & Q(**{f'{field_name}__{lookup}': value})
+            equality &= Q(**{field_name: value})
+        return bound & condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = [self.get_field_value(self.page[-1], field.lstrip('-')) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position))
+
+    @staticmethod
+    def get_field_value(instance, field_name):
+        for attribute in field_name.split(LOOKUP_SEP):
+            instance = getattr(instance, attribute)
+        return instance
+
+    @staticmethod
+    def encode_cursor(position):
+        return base64.urlsafe_b64encode(json.dumps(position, cls=DjangoJSONEncoder).encode()).decode()
+
+    def decode_cursor(self, encoded_cursor):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded_cursor.encode()))
+        except (binascii.Error, ValueError) as ex:
+            raise NotFound(self.invalid_cursor_message) from ex
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
 
 
 class PageNumberPagination(DrfPageNumberPagination):
+    """
+    Page number pagination that switches to keyset pagination when a client passes `pagination=cursor`.
+    """
+
     page_size_query_param = 'page_size'
     page_size = 40
     max_page_size = 50
+    pagination_mode_query_param = 'pagination'
+    keyset_pagination_mode = 'cursor'
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+        if request.query_params.get(self.pagination_mode_query_param) == self.keyset_pagination_mode:
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class OptionalPageNumberPagination(PageNumberPagination):
+    """
+    Pagination for endpoints that historically return complete lists: a page is built only on request.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        pagination_params = (self.page_query_param, self.page_size_query_param, self.pagination_mode_query_param)
+        if not any(param in request.query_params for param in pagination_params):
+            return None
+        return super().paginate_queryset(queryset, request, view)
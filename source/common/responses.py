@@ -0,0 +1,23 @@
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingJSONArrayResponse(StreamingHttpResponse):
+    """
+    JSON array response rendered element by element while the items are being iterated.
+    """
+
+    renderer_class = JSONRenderer
+
+    def __init__(self, items, *args, **kwargs):
+        kwargs.setdefault('content_type', self.renderer_class.media_type)
+        super().__init__(self.render_items(items), *args, **kwargs)
+
+    def render_items(self, items):
+        renderer = self.renderer_class()
+        yield b'['
+        for index, item in enumerate(items):
+            if index:
+                yield b','
+            yield renderer.render(item)
+        yield b']'
@@ -0,0 +1,14 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import ISO_8601, serializers
+
+from common.constants import DATETIME_DESERIALIZATION_FORMAT
+
+
+class StatisticsPeriodSerializer(serializers.Serializer):
+    start_date = serializers.DateField(input_formats=(ISO_8601, DATETIME_DESERIALIZATION_FORMAT))
+    end_date = serializers.DateField(input_formats=(ISO_8601, DATETIME_DESERIALIZATION_FORMAT))
+
+    def validate(self, attrs):
+        if attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError(_('The start date must not be after the end date.'))
+        return attrs
@@ -0,0 +1,30 @@
+from collections import deque
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def moving_average(values, window):
+    """
+    Trailing moving average; the leading items are averaged over the values available so far.
+
+    The computation is vectorized with NumPy when it is installed.
+    """
+    if numpy is not None:
+        cumulative_sums = numpy.cumsum(numpy.asarray(values, dtype=float))
+        window_sums = cumulative_sums.copy()
+        window_sums[window:] -= cumulative_sums[:-window]
+        return (window_sums / numpy.minimum(numpy.arange(1, len(values) + 1), window)).tolist()
+
+    averages = []
+    window_values = deque()
+    window_sum = 0.0
+    for value in values:
+        window_values.append(value)
+        window_sum += value
+        if len(window_values) > window:
+            window_sum -= window_values.popleft()
+        averages.append(window_sum / len(window_values))
+    return averages
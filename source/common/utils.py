@@ -1,11 +1,12 @@
 import base64
 import datetime
+import hashlib
 import re
 from uuid import uuid4
 
 from django.conf import settings
 
-from common.constants import BASE64_METADATA_REGEXP
+from common.constants import BASE64_METADATA_REGEXP, IMAGE_VARIANTS_SIZES, MAIN_IMAGE_VARIANT, PROCESSED_IMAGE_EXTENSION
 
 
 def get_file_format_from_base64_metadata(metadata):
@@ -24,14 +25,35 @@ def save_media_file(path, media_file, filename=None, file_format='.png'):
     return f'{path}/{filename}'
 
 
-def save_base64_encoded_file(encoded_file, saving_path):
+def decode_base64_encoded_file(encoded_file):
     metadata, encoded_content = encoded_file.split(',')
-    file_format = get_file_format_from_base64_metadata(metadata)
-    return save_media_file(saving_path, base64.standard_b64decode(encoded_content), file_format=file_format)
+    return base64.standard_b64decode(encoded_content), get_file_format_from_base64_metadata(metadata)
+
+
+def save_base64_encoded_file(encoded_file, saving_path):
+    media_file, file_format = decode_base64_encoded_file(encoded_file)
+    return save_media_file(saving_path, media_file, file_format=file_format)
+
+
+def get_content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_image_variant_name(name, variant=None):
+    """
+    Return the name of the variant of a processed image; unprocessed images only have the original.
+    """
+    if variant in (None, MAIN_IMAGE_VARIANT) or not name.endswith(f'.{PROCESSED_IMAGE_EXTENSION}'):
+        return name
+    return f'{name[: -len(PROCESSED_IMAGE_EXTENSION) - 1]}.{variant}.{PROCESSED_IMAGE_EXTENSION}'
+
+
+def get_image_variants_names(name):
+    return list(dict.fromkeys(get_image_variant_name(name, variant) for variant in IMAGE_VARIANTS_SIZES))
 
 
-def build_absolute_url_to_media_file(media_file_url):
-    return f"{settings.BASE_URL}{settings.MEDIA_URL}{media_file_url}"
+def build_absolute_url_to_media_file(media_file_url, variant=None):
+    return f"{settings.BASE_URL}{settings.MEDIA_URL}{get_image_variant_name(media_file_url, variant)}"
 
 
 def get_start_of_date(date):
@@ -0,0 +1,8 @@
+"""
+Dish response caches.
+"""
+from django.conf import settings
+
+from common.cache import VersionedCache
+
+menu_cache = VersionedCache('menu', timeout=settings.MENU_CACHE_TIMEOUT)
@@ -1,2 +1,22 @@
+import datetime
+
 PHOTOS_FOLDER_NAME = 'photos'
 MEDIA_FOLDER_NAME = 'dish'
+ORDERING_STATISTICS_GROUPING_FIELDS = {
+    'dish': ('catering_establishment_dish__dish', 'catering_establishment_dish__dish__name'),
+    'category': (
+        'catering_establishment_dish__dish__subcategory__category',
+        'catering_establishment_dish__dish__subcategory__category__name',
+    ),
+}
+ORDERING_STATISTICS_BUCKETS = ('day', 'week', 'month')
+DISCOUNT_TRANSITION_RETRY_DELAY = datetime.timedelta(seconds=30)
+DISCOUNT_TRANSITIONS_POLL_INTERVAL = datetime.timedelta(minutes=1)
+MENU_CACHE_KEY = 'menu'
+MENU_FILTERS_ATTRIBUTES = {
+    'final_price_min': ('final_price', 'ge'),
+    'final_price_max': ('final_price', 'le'),
+    'category': ('category', 'eq'),
+    'subcategory': ('subcategory', 'eq'),
+    'food': ('food', 'eq'),
+}
@@ -1,13 +1,109 @@
-from django.db.models.signals import post_delete
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
+from catering_establishment.models import Booking
 from dish import models as dish_models
+from dish.caches import menu_cache
+from dish.services import (
+    change_ordered_dish_statistics,
+    move_booking_dishes_ordering_statistics,
+    refresh_effective_prices,
+)
+from uploads.services import release_image
 
 
 @receiver(post_delete, sender=dish_models.CateringEstablishmentDish)
 def delete_media_file(sender, instance, *args, **kwargs):
-    try:
-        # BUG: Deletion is not successful
-        instance.photo.delete(save=False)
-    except:
-        pass
+    release_image(instance.photo.name)
+
+
+@receiver(post_save, sender=dish_models.CateringEstablishmentDish)
+def update_search_vector(sender, instance, update_fields=None, *args, **kwargs):
+    if update_fields and not {'dish', 'description'} & set(update_fields):
+        return
+    dish_models.CateringEstablishmentDish.objects.filter(pk=instance.pk).update_search_vector()
+
+
+@receiver(post_save, sender=dish_models.CateringEstablishmentDish)
+def update_effective_price(sender, instance, update_fields=None, *args, **kwargs):
+    if update_fields and 'price' not in update_fields:
+        return
+    refresh_effective_prices((instance.pk,))
+
+
+@receiver(post_save, sender=dish_models.Discount)
+@receiver(post_delete, sender=dish_models.Discount)
+def update_discounted_dish_effective_price(sender, instance, *args, **kwargs):
+    refresh_effective_prices((instance.catering_establishment_dish_id,))
+
+
+@receiver(post_save, sender=dish_models.CateringEstablishmentDish)
+@receiver(post_delete, sender=dish_models.CateringEstablishmentDish)
+def invalidate_menu_cache(sender, instance, *args, **kwargs):
+    transaction.on_commit(lambda: menu_cache.bump_version(instance.catering_establishment_id))
+
+
+@receiver(post_save, sender=dish_models.Discount)
+@receiver(post_delete, sender=dish_models.Discount)
+def invalidate_discounted_dish_menu_cache(sender, instance, *args, **kwargs):
+    catering_establishment_id = (
+        dish_models.CateringEstablishmentDish.objects.filter(pk=instance.catering_establishment_dish_id)
+        .values_list('catering_establishment', flat=True)
+        .first()
+    )
+    if catering_establishment_id is not None:
+        transaction.on_commit(lambda: menu_cache.bump_version(catering_establishment_id))
+
+
+@receiver(post_save, sender=dish_models.Dish)
+def update_catering_establishment_dishes_search_vector(sender, instance, *args, **kwargs):
+    dish_models.CateringEstablishmentDish.objects.filter(dish=instance).update_search_vector()
+
+
+@receiver(post_save, sender=dish_models.Dish)
+def invalidate_dish_menus_cache(sender, instance, *args, **kwargs):
+    catering_establishments_ids = set(
+        dish_models.CateringEstablishmentDish.objects.filter(dish=instance).values_list(
+            'catering_establishment', flat=True
+        )
+    )
+    transaction.on_commit(lambda: [menu_cache.bump_version(scope) for scope in catering_establishments_ids])
+
+
+@receiver(pre_save, sender=dish_models.OrderedDish)
+def remember_ordered_dish_statistics_values(sender, instance, *args, **kwargs):
+    # Only changed ordered dishes have values to take back from the rollup, so creations cost no query.
+    instance.previous_statistics_values = (
+        None
+        if instance._state.adding
+        else dish_models.OrderedDish.objects.filter(pk=instance.pk)
+        .values_list('booking', 'catering_establishment_dish', 'weight')
+        .first()
+    )
+
+
+@receiver(post_save, sender=dish_models.OrderedDish)
+def add_ordered_dish_to_statistics(sender, instance, *args, **kwargs):
+    if instance.previous_statistics_values is not None:
+        change_ordered_dish_statistics(*instance.previous_statistics_values, sign=-1)
+    change_ordered_dish_statistics(instance.booking_id, instance.catering_establishment_dish_id, instance.weight)
+
+
+@receiver(post_delete, sender=dish_models.OrderedDish)
+def subtract_ordered_dish_from_statistics(sender, instance, *args, **kwargs):
+    change_ordered_dish_statistics(
+        instance.booking_id, instance.catering_establishment_dish_id, instance.weight, sign=-1
+    )
+
+
+@receiver(post_save, sender=Booking)
+def move_rescheduled_booking_dishes_statistics(sender, instance, created, *args, **kwargs):
+    # The previous values are remembered by the catering establishment booking statistics handlers.
+    if created or instance.previous_statistics_values is None:
+        return
+    previous_date = timezone.localtime(instance.previous_statistics_values[1]).date()
+    date = timezone.localtime(instance.start_datetime).date()
+    if previous_date != date:
+        move_booking_dishes_ordering_statistics(instance.pk, previous_date, date)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dish.services import rebuild_daily_dish_ordering_statistics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily dish ordering statistics from all ordered dishes.'
+
+    def handle(self, *args, **options):
+        rebuild_daily_dish_ordering_statistics()
+        self.stdout.write(self.style.SUCCESS('Daily dish ordering statistics have been rebuilt.'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from dish.schedulers import discount_transitions_scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute effective prices of establishment dishes when their discounts start and end. '
+        'Exactly one instance should run per deployment.'
+    )
+
+    def handle(self, *args, **options):
+        discount_transitions_scheduler.run()
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from catering_establishment.models import CateringEstablishment
+from dish.services import cache_menu
+
+
+class Command(BaseCommand):
+    help = 'Build the cached menus of catering establishments ahead of the first menu requests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'catering_establishments',
+            nargs='*',
+            type=int,
+            help='Ids of the establishments whose menus are cached; all visible establishments by default.',
+        )
+
+    def handle(self, *args, **options):
+        catering_establishments_ids = options['catering_establishments'] or list(
+            CateringEstablishment.objects.visible_only().values_list('id', flat=True)
+        )
+        for catering_establishment_id in catering_establishments_ids:
+            cache_menu(catering_establishment_id)
+        self.stdout.write(self.style.SUCCESS(f'{len(catering_establishments_ids)} menus cached.'))
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def fill_search_vectors(apps, schema_editor):
+    Dish = apps.get_model('dish', 'Dish')
+    CateringEstablishmentDish = apps.get_model('dish', 'CateringEstablishmentDish')
+
+    dish_name = Subquery(Dish.objects.filter(pk=OuterRef('dish')).values('name')[:1])
+    CateringEstablishmentDish.objects.update(
+        search_vector=(
+            SearchVector(dish_name, weight='A', config='simple')
+            + SearchVector('description', weight='B', config='simple')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('dish', '0005_alter_dish_options_alter_dishcategory_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cateringestablishmentdish',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='cateringestablishmentdish',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_vector'], name='dish_cateri_search__ee718d_gin'
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:17
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def fill_daily_dish_ordering_statistics(apps, schema_editor):
+    OrderedDish = apps.get_model('dish', 'OrderedDish')
+    DailyDishOrderingStatistics = apps.get_model('dish', 'DailyDishOrderingStatistics')
+
+    statistics = (
+        OrderedDish.objects.annotate(date=TruncDate('booking__start_datetime'))
+        .order_by()
+        .values('catering_establishment_dish', 'date')
+        .annotate(orders_count=Count('id'), total_weight=Sum('weight'))
+    )
+    DailyDishOrderingStatistics.objects.bulk_create(
+        (
+            DailyDishOrderingStatistics(
+                catering_establishment_dish_id=statistics_item.pop('catering_establishment_dish'),
+                **statistics_item,
+            )
+            for statistics_item in statistics.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('dish', '0006_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyDishOrderingStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('orders_count', models.PositiveIntegerField(default=0)),
+                ('total_weight', models.FloatField(default=0)),
+                (
+                    'catering_establishment_dish',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='daily_ordering_statistics',
+                        to='dish.cateringestablishmentdish',
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailydishorderingstatistics',
+            index=models.Index(fields=['date', 'catering_establishment_dish'], name='dish_dailyd_date_073030_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailydishorderingstatistics',
+            unique_together={('catering_establishment_dish', 'date')},
+        ),
+        migrations.RunPython(fill_daily_dish_ordering_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:33
+
+from django.db import migrations, models
+from django.db.models import Case, F, FloatField, OuterRef, Subquery, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def fill_effective_prices(apps, schema_editor):
+    CateringEstablishmentDish = apps.get_model('dish', 'CateringEstablishmentDish')
+    Discount = apps.get_model('dish', 'Discount')
+
+    now = timezone.now()
+    discounted_price = (
+        Discount.objects.filter(
+            catering_establishment_dish=OuterRef('pk'), start_datetime__lte=now, end_datetime__gt=now
+        )
+        .annotate(
+            discounted_price=Case(
+                When(type='percent', then=OuterRef('price') - OuterRef('price') * F('amount') / 100),
+                When(type='cash_value', then=OuterRef('price') - F('amount')),
+                output_field=FloatField(),
+            )
+        )
+        .values('discounted_price')
+    )
+    CateringEstablishmentDish.objects.update(effective_price=Coalesce(Subquery(discounted_price[:1]), F('price')))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('dish', '0008_photo_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cateringestablishmentdish',
+            name='effective_price',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_effective_prices, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='cateringestablishmentdish',
+            index=models.Index(
+                fields=['catering_establishment', 'effective_price'], name='dish_cateri_caterin_11f7c1_idx'
+            ),
+        ),
+    ]
@@ -1,14 +1,17 @@
 """
 Dish models.
 """
-from datetime import datetime
-
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
-from django.db.models import Case, When, F, Q
+from django.db.models import Case, When, F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from catering_establishment.models import Booking, CateringEstablishment
-from common.models import TimeRangedModel
+from common.constants import FULL_TEXT_SEARCH_CONFIG
+from common.models import DailyStatisticsManager, TimeRangedModel
 
 
 class DishCategory(models.Model):
@@ -45,26 +48,11 @@ class Food(models.Model):
         verbose_name_plural = _("Foods")
 
 
-class DishQuerySet(models.QuerySet):
-    def with_ordering_count(self):
-        return super().annotate(orders_count=models.Count('catering_establishment_dishes__ordered_dishes'))
-
-
-class DishManager(models.Manager):
-    def get_queryset(self):
-        return DishQuerySet(self.model, using=self._db)
-
-    def with_ordering_count(self):
-        return self.get_queryset().with_ordering_count()
-
-
 class Dish(models.Model):
     name = models.CharField(max_length=64)
     food = models.ForeignKey(Food, on_delete=models.CASCADE)
     subcategory = models.ForeignKey(DishSubcategory, on_delete=models.CASCADE, related_name='dishes')
 
-    objects = DishManager()
-
     def __str__(self):
         return self.name
 
@@ -73,30 +61,63 @@ class Dish(models.Model):
         verbose_name_plural = _("Dishes")
 
 
-class CateringEstablishmentDishQuerySet(models.QuerySet):
-    def with_final_price(self):
-        now = datetime.now()
-        return super().annotate(
-            final_price=Case(
-                When(
-                    Q(discount__type=Discount.PERCENT)
-                    & Q(discount__start_datetime__lte=now)
-                    & Q(discount__end_datetime__gte=now),
-                    then=F('price') - (F('price') * F('discount__amount') / 100),
-                ),
-                When(
-                    Q(discount__type=Discount.CASH_VALUE)
-                    & Q(discount__start_datetime__lte=now)
-                    & Q(discount__end_datetime__gte=now),
-                    then=F('price') - F('discount__amount'),
-                ),
-                default='price',
+def get_effective_price(now):
+    """
+    Price of an establishment dish with its discount applied if the discount is active at the given moment.
+
+    A discount is active from its start datetime inclusive to its end datetime exclusive, so that the price
+    changes exactly at both transitions.
+    """
+    discounted_price = (
+        Discount.objects.filter(
+            catering_establishment_dish=OuterRef('pk'), start_datetime__lte=now, end_datetime__gt=now
+        )
+        .annotate(
+            discounted_price=Case(
+                When(type=Discount.PERCENT, then=OuterRef('price') - OuterRef('price') * F('amount') / 100),
+                When(type=Discount.CASH_VALUE, then=OuterRef('price') - F('amount')),
+                output_field=FloatField(),
             )
         )
+        .values('discounted_price')
+    )
+    return Coalesce(Subquery(discounted_price[:1]), F('price'))
+
+
+class CateringEstablishmentDishQuerySet(models.QuerySet):
+    def with_final_price(self):
+        return super().annotate(final_price=F('effective_price'))
 
     def with_active_discount(self):
-        now = datetime.now()
-        return super().filter(discount__start_datetime__lte=now, discount__end_datetime__gte=now)
+        now = timezone.now()
+        return super().filter(discount__start_datetime__lte=now, discount__end_datetime__gt=now)
+
+    def update_effective_price(self):
+        return super().update(effective_price=get_effective_price(timezone.now()))
+
+    def update_changed_effective_price(self):
+        """
+        Update only the dishes whose effective price is no longer current and return their establishments.
+        """
+        now = timezone.now()
+        changed_dishes = dict(
+            super()
+            .alias(current_effective_price=get_effective_price(now))
+            .exclude(effective_price=F('current_effective_price'))
+            .values_list('pk', 'catering_establishment')
+        )
+        if changed_dishes:
+            super().filter(pk__in=changed_dishes).update(effective_price=get_effective_price(now))
+        return set(changed_dishes.values())
+
+    def update_search_vector(self):
+        dish_name = Subquery(Dish.objects.filter(pk=OuterRef('dish')).values('name')[:1])
+        return super().update(
+            search_vector=(
+                SearchVector(dish_name, weight='A', config=FULL_TEXT_SEARCH_CONFIG)
+                + SearchVector('description', weight='B', config=FULL_TEXT_SEARCH_CONFIG)
+            )
+        )
 
 
 class CateringEstablishmentDishManager(models.Manager):
@@ -119,13 +140,22 @@ class CateringEstablishmentDish(models.Model):
     dish = models.ForeignKey(Dish, on_delete=models.CASCADE, related_name='catering_establishment_dishes')
     description = models.TextField()
     photo = models.ImageField(upload_to='dish/photos/')
+    photo_hash = models.CharField(max_length=64, blank=True, editable=False)
     price = models.FloatField()
+    effective_price = models.FloatField(editable=False, default=0)
+    search_vector = SearchVectorField(editable=False, null=True)
 
     objects = CateringEstablishmentDishManager()
 
     def __str__(self):
         return f'{self.dish} - {self.catering_establishment}'
 
+    class Meta:
+        indexes = (
+            GinIndex(fields=('search_vector',)),
+            models.Index(fields=('catering_establishment', 'effective_price')),
+        )
+
 
 class Discount(TimeRangedModel):
     PERCENT = 'percent'
@@ -154,3 +184,27 @@ class OrderedDish(models.Model):
 
     def __str__(self):
         return f'{self.booking} - {self.catering_establishment_dish.dish.name}'
+
+
+class DailyDishOrderingStatistics(models.Model):
+    """
+    Orders of a catering establishment dish made for bookings starting on a particular local day.
+    """
+
+    catering_establishment_dish = models.ForeignKey(
+        CateringEstablishmentDish,
+        on_delete=models.CASCADE,
+        related_name='daily_ordering_statistics',
+    )
+    date = models.DateField()
+    orders_count = models.PositiveIntegerField(default=0)
+    total_weight = models.FloatField(default=0)
+
+    objects = DailyStatisticsManager(count_field='orders_count')
+
+    def __str__(self):
+        return f'{self.catering_establishment_dish} ({self.date})'
+
+    class Meta:
+        unique_together = ('catering_establishment_dish', 'date')
+        indexes = (models.Index(fields=('date', 'catering_establishment_dish')),)
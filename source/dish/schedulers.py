@@ -0,0 +1,69 @@
+"""
+Scheduler that recomputes effective prices of establishment dishes when their discounts start and end.
+"""
+import logging
+import time
+
+from django.db import connections
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from dish import models as dish_models
+from dish.caches import menu_cache
+from dish.constants import DISCOUNT_TRANSITION_RETRY_DELAY, DISCOUNT_TRANSITIONS_POLL_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class DiscountTransitionsScheduler:
+    """
+    A loop run by the single `run_discount_transitions` process, which sleeps until the nearest discount start or
+    end stored in the database and recomputes the effective prices of the dishes whose transitions passed.
+
+    Saving a discount recomputes its dish's price right away, but its transitions are only read by the loop, so it
+    wakes up at least every DISCOUNT_TRANSITIONS_POLL_INTERVAL to pick up discounts saved meanwhile.
+    """
+
+    def run(self):
+        # Transitions that passed while the scheduler was not running are caught up first.
+        refreshed_until = None
+        while True:
+            now = timezone.now()
+            try:
+                self._refresh_effective_prices(refreshed_until, now)
+                refreshed_until = now
+                timeout = self._get_next_transition_timeout(now)
+            except Exception:  # pylint: disable=broad-except
+                # The period is refreshed again after the delay, so no transition is skipped.
+                logger.exception('Refreshing effective prices at discount transitions failed.')
+                timeout = DISCOUNT_TRANSITION_RETRY_DELAY
+            finally:
+                connections.close_all()
+            time.sleep(max(timeout.total_seconds(), 0))
+
+    @staticmethod
+    def _refresh_effective_prices(refreshed_until, now):
+        catering_establishment_dishes = dish_models.CateringEstablishmentDish.objects.filter(discount__isnull=False)
+        if refreshed_until is not None:
+            catering_establishment_dishes = catering_establishment_dishes.filter(
+                Q(discount__start_datetime__gt=refreshed_until, discount__start_datetime__lte=now)
+                | Q(discount__end_datetime__gt=refreshed_until, discount__end_datetime__lte=now)
+            )
+        # Only menus with changed prices are invalidated, so that starting the scheduler does not empty the cache.
+        for catering_establishment_id in catering_establishment_dishes.update_changed_effective_price():
+            menu_cache.bump_version(catering_establishment_id)
+
+    @staticmethod
+    def _get_next_transition_timeout(now):
+        next_transitions = dish_models.Discount.objects.aggregate(
+            start_datetime=Min('start_datetime', filter=Q(start_datetime__gt=now)),
+            end_datetime=Min('end_datetime', filter=Q(end_datetime__gt=now)),
+        )
+        next_transition_datetime = min(
+            (transition for transition in next_transitions.values() if transition is not None),
+            default=now + DISCOUNT_TRANSITIONS_POLL_INTERVAL,
+        )
+        return min(next_transition_datetime - timezone.now(), DISCOUNT_TRANSITIONS_POLL_INTERVAL)
+
+
+discount_transitions_scheduler = DiscountTransitionsScheduler()
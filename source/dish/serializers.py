@@ -1,8 +1,10 @@
 from rest_framework import serializers
 
 from catering_establishment import models as ce_models
-from common.validators import validate_encoded_file
+from common.serializers import StatisticsPeriodSerializer
 from dish import models as dish_models
+from dish.constants import ORDERING_STATISTICS_BUCKETS, ORDERING_STATISTICS_GROUPING_FIELDS
+from uploads.serializers import ImageVariantField, MediaField
 
 
 class DishSerializer(serializers.ModelSerializer):
@@ -59,7 +61,7 @@ class DiscountSerializer(serializers.ModelSerializer):
 
 
 class CateringEstablishmentDishSerializer(serializers.ModelSerializer):
-    photo = serializers.CharField(validators=[validate_encoded_file])
+    photo = MediaField()
     discount = DiscountSerializer(required=False)
 
     class Meta:
@@ -79,6 +81,7 @@ class CateringEstablishmentDishFinalPriceSerializer(serializers.ModelSerializer)
 
 
 class CateringEstablishmentMenuItemSerializer(serializers.ModelSerializer):
+    photo = ImageVariantField(variant='card')
     dish = DishCharacteristicsSerializer()
     discount = DiscountSerializer()
     final_price = serializers.FloatField()
@@ -113,9 +116,22 @@ class OrderUpdateSerializer(serializers.Serializer):
     ordered_dishes = OrderedDishReadSerializer(many=True)
 
 
-class DishOrderingStatisticsSerializer(serializers.ModelSerializer):
+class DishesOrderingStatisticsQuerySerializer(StatisticsPeriodSerializer):
+    catering_establishment = serializers.IntegerField(required=False)
+    group_by = serializers.ChoiceField(choices=tuple(ORDERING_STATISTICS_GROUPING_FIELDS), default='dish')
+    bucket = serializers.ChoiceField(choices=ORDERING_STATISTICS_BUCKETS, required=False)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+
+class OrderingStatisticsPeriodSerializer(serializers.Serializer):
+    period = serializers.DateField()
     orders_count = serializers.IntegerField()
+    total_weight = serializers.FloatField()
 
-    class Meta:
-        model = dish_models.Dish
-        fields = ('name', 'orders_count')
+
+class DishOrderingStatisticsSerializer(serializers.Serializer):
+    id = serializers.IntegerField(source='item_id')
+    name = serializers.CharField()
+    orders_count = serializers.IntegerField()
+    total_weight = serializers.FloatField()
+    periods = OrderingStatisticsPeriodSerializer(many=True, required=False)
@@ -1,4 +1,90 @@
+import operator
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Trunc, TruncDate
+from django.utils import timezone
+
+from catering_establishment.services import get_booking_statistics_day
+from dish import constants
 from dish import models as dish_models
+from dish import serializers as dish_serializers
+from dish.caches import menu_cache
+
+
+def refresh_effective_prices(catering_establishment_dishes_ids):
+    dish_models.CateringEstablishmentDish.objects.filter(
+        pk__in=catering_establishment_dishes_ids
+    ).update_effective_price()
+
+
+def build_menu(catering_establishment_id):
+    """
+    Serialize the whole menu of an establishment along with the attributes that menu requests filter and order by.
+    """
+    now = timezone.now()
+    catering_establishment_dishes = list(
+        dish_models.CateringEstablishmentDish.objects.filter(catering_establishment=catering_establishment_id)
+        .select_related('dish__subcategory__category', 'dish__food', 'discount')
+        .defer('search_vector')
+        .with_final_price()
+        .order_by('id')
+    )
+    items = dish_serializers.CateringEstablishmentMenuItemSerializer(catering_establishment_dishes, many=True).data
+
+    menu = []
+    for catering_establishment_dish, item in zip(catering_establishment_dishes, items):
+        discount = getattr(catering_establishment_dish, 'discount', None)
+        attributes = {
+            'final_price': catering_establishment_dish.final_price,
+            'dish__name': catering_establishment_dish.dish.name,
+            'category': catering_establishment_dish.dish.subcategory.category_id,
+            'subcategory': catering_establishment_dish.dish.subcategory_id,
+            'food': catering_establishment_dish.dish.food_id,
+            # Discount transitions bump the menu version, so the flag holds as long as the cached menu.
+            'has_active_discount': discount is not None and discount.start_datetime <= now < discount.end_datetime,
+        }
+        menu.append((attributes, dict(item)))
+    return menu
+
+
+def cache_menu(catering_establishment_id):
+    version = menu_cache.get_version(catering_establishment_id)
+    menu = build_menu(catering_establishment_id)
+    menu_cache.set(constants.MENU_CACHE_KEY, menu, catering_establishment_id, version)
+    return menu
+
+
+def get_menu(catering_establishment_id):
+    version = menu_cache.get_version(catering_establishment_id)
+    if (menu := menu_cache.get(constants.MENU_CACHE_KEY, catering_establishment_id, version)) is None:
+        menu = build_menu(catering_establishment_id)
+        menu_cache.set(constants.MENU_CACHE_KEY, menu, catering_establishment_id, version)
+    return menu
+
+
+def filter_menu(menu, filters, ordering=None):
+    """
+    Apply the menu filters and ordering to a built menu in memory, as the menu view applies them in the database.
+    """
+    conditions = [
+        (attribute, getattr(operator, comparison), filters[filter_name])
+        for filter_name, (attribute, comparison) in constants.MENU_FILTERS_ATTRIBUTES.items()
+        if filters.get(filter_name) is not None
+    ]
+    if filters.get('has_discount') is not None:
+        conditions.append(('has_active_discount', operator.eq, True))
+
+    menu = [
+        (attributes, item)
+        for attributes, item in menu
+        if all(compare(attributes[attribute], value) for attribute, compare, value in conditions)
+    ]
+    # Sorting is stable, so sorting by the fields from the last to the first orders by all of them.
+    for field in reversed(ordering or ()):
+        menu.sort(key=lambda menu_item: menu_item[0][field.lstrip('-')], reverse=field.startswith('-'))
+    return [item for _, item in menu]
 
 
 def delete_booking_related_ordered_dishes(booking_id):
@@ -6,7 +92,7 @@ def delete_booking_related_ordered_dishes(booking_id):
 
 
 def bulk_create_ordered_dishes(booking, ordered_dishes_data):
-    dish_models.OrderedDish.objects.bulk_create(
+    ordered_dishes = dish_models.OrderedDish.objects.bulk_create(
         [
             dish_models.OrderedDish(
                 booking_id=booking,
@@ -16,3 +102,95 @@ def bulk_create_ordered_dishes(booking, ordered_dishes_data):
             for data_item in ordered_dishes_data
         ]
     )
+    # bulk_create bypasses post_save signals, so the whole order is added to the rollup at once.
+    if ordered_dishes and (statistics_day := get_booking_statistics_day(booking)):
+        change_daily_dish_ordering_statistics(
+            [(ordered_dish.catering_establishment_dish_id, ordered_dish.weight) for ordered_dish in ordered_dishes],
+            statistics_day[1],
+        )
+
+
+def change_daily_dish_ordering_statistics(ordered_dishes, date, sign=1):
+    """
+    Add the ordered dishes, given as (catering establishment dish, weight) pairs, to the rollup of the date,
+    or subtract them from it when the sign is negative.
+    """
+    deltas = defaultdict(lambda: [0, 0.0])
+    for catering_establishment_dish_id, weight in ordered_dishes:
+        deltas[catering_establishment_dish_id][0] += sign
+        deltas[catering_establishment_dish_id][1] += sign * weight
+    # Rows are changed in a fixed order, so that transactions changing the same rows do not deadlock.
+    for catering_establishment_dish_id in sorted(deltas):
+        orders_count, total_weight = deltas[catering_establishment_dish_id]
+        dish_models.DailyDishOrderingStatistics.objects.change_counters(
+            {'catering_establishment_dish_id': catering_establishment_dish_id, 'date': date},
+            orders_count=orders_count,
+            total_weight=total_weight,
+        )
+
+
+def change_ordered_dish_statistics(booking_id, catering_establishment_dish_id, weight, sign=1):
+    if statistics_day := get_booking_statistics_day(booking_id):
+        change_daily_dish_ordering_statistics([(catering_establishment_dish_id, weight)], statistics_day[1], sign)
+
+
+def move_booking_dishes_ordering_statistics(booking_id, previous_date, date):
+    ordered_dishes = list(
+        dish_models.OrderedDish.objects.filter(booking=booking_id).values_list('catering_establishment_dish', 'weight')
+    )
+    change_daily_dish_ordering_statistics(ordered_dishes, previous_date, -1)
+    change_daily_dish_ordering_statistics(ordered_dishes, date)
+
+
+def rebuild_daily_dish_ordering_statistics():
+    statistics = (
+        dish_models.OrderedDish.objects.annotate(date=TruncDate('booking__start_datetime'))
+        .order_by()
+        .values('catering_establishment_dish', 'date')
+        .annotate(orders_count=Count('id'), total_weight=Sum('weight'))
+    )
+    with transaction.atomic():
+        dish_models.DailyDishOrderingStatistics.objects.all().delete()
+        dish_models.DailyDishOrderingStatistics.objects.bulk_create(
+            (
+                dish_models.DailyDishOrderingStatistics(
+                    catering_establishment_dish_id=statistics_item.pop('catering_establishment_dish'),
+                    **statistics_item,
+                )
+                for statistics_item in statistics.iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+def get_dishes_ordering_statistics(statistics, group_by, bucket=None, limit=None):
+    """
+    Summarize daily dish ordering statistics per dish or dish category, most ordered first.
+
+    Without a bucket the summary is returned as a lazy queryset. When a bucket is given, every summarized item
+    additionally gets its statistics split by day, week or month.
+    """
+    group_field, name_field = constants.ORDERING_STATISTICS_GROUPING_FIELDS[group_by]
+    items = (
+        statistics.order_by()
+        .values(item_id=F(group_field), name=F(name_field))
+        .annotate(orders_count=Sum('orders_count'), total_weight=Sum('total_weight'))
+        .order_by('-orders_count', 'name')[:limit]
+    )
+    if bucket is None:
+        return items
+
+    items = list(items)
+    items_periods = defaultdict(list)
+    periods_statistics = (
+        statistics.filter(**{f'{group_field}__in': [item['item_id'] for item in items]})
+        .order_by()
+        .values(item_id=F(group_field), period=Trunc('date', bucket))
+        .annotate(orders_count=Sum('orders_count'), total_weight=Sum('total_weight'))
+        .order_by('period')
+    )
+    for period_statistics in periods_statistics:
+        items_periods[period_statistics.pop('item_id')].append(period_statistics)
+    for item in items:
+        item['periods'] = items_periods[item['item_id']]
+    return items
@@ -1,8 +1,9 @@
 """
 Dish views.
 """
+from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import CreateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -10,10 +11,19 @@ from rest_framework import status
 from rest_framework.views import APIView
 
 from catering_establishment.permissions import IsBookingAuthor
+from common.constants import STREAMING_RESPONSE_CHUNK_SIZE
+from common.filters import FullTextSearchFilter
+from common.responses import StreamingJSONArrayResponse
 from dish import models as dish_models
 from dish import serializers as dish_serializers
 from dish.filters import CateringEstablishmentMenuFilter
-from dish.services import bulk_create_ordered_dishes, delete_booking_related_ordered_dishes
+from dish.services import (
+    bulk_create_ordered_dishes,
+    delete_booking_related_ordered_dishes,
+    filter_menu,
+    get_dishes_ordering_statistics,
+    get_menu,
+)
 
 
 class DishesRelatedDataView(APIView):
@@ -51,11 +61,39 @@ class CateringEstablishmentMenuView(ListAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = dish_serializers.CateringEstablishmentMenuItemSerializer
     queryset = dish_models.CateringEstablishmentDish.objects.with_final_price()
-    filter_backends = (DjangoFilterBackend, OrderingFilter, SearchFilter)
-    search_fields = ('dish__name',)
+    filter_backends = (DjangoFilterBackend, OrderingFilter, FullTextSearchFilter)
     ordering_fields = ('dish__name', 'final_price')
     filterset_class = CateringEstablishmentMenuFilter
 
+    def list(self, request, *args, **kwargs):
+        if (menu_query := self.get_menu_query(request)) is None:
+            return super().list(request, *args, **kwargs)
+
+        filters, ordering = menu_query
+        items = filter_menu(get_menu(int(filters['catering_establishment'])), filters, ordering)
+        page = self.paginate_queryset(items)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(items)
+
+    def get_menu_query(self, request):
+        """
+        Return the filters and ordering of a request that can be answered from the cached menu of an establishment.
+
+        Searches, keyset pages and requests without a valid establishment filter go to the database.
+        """
+        if request.query_params.get(FullTextSearchFilter.search_param):
+            return None
+        if (
+            request.query_params.get(self.paginator.pagination_mode_query_param)
+            == self.paginator.keyset_pagination_mode
+        ):
+            return None
+        filterset = self.filterset_class(request.query_params, queryset=self.get_queryset(), request=request)
+        if not filterset.is_valid() or filterset.form.cleaned_data['catering_establishment'] is None:
+            return None
+        return filterset.form.cleaned_data, OrderingFilter().get_ordering(request, self.get_queryset(), self)
+
 
 class OrderPopulationView(CreateAPIView):
     permission_classes = (IsAuthenticated, IsBookingAuthor)
@@ -74,22 +112,25 @@ class OrderUpdateView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class DishesOrderingStatisticsView(ListAPIView):
+class DishesOrderingStatisticsView(APIView):
     permission_classes = (IsAuthenticated,)
-    serializer_class = dish_serializers.DishOrderingStatisticsSerializer
-    pagination_class = None
 
-    def get_queryset(self):
-        filters = {
-            'catering_establishment_dishes__catering_establishment__owner': self.request.user,
-            'catering_establishment_dishes__ordered_dishes__booking__start_datetime__gte': (
-                self.request.query_params.get('start_date')
-            ),
-            'catering_establishment_dishes__ordered_dishes__booking__end_datetime__lte': (
-                self.request.query_params.get('end_date')
-            ),
-        }
-        if catering_establishment := self.request.query_params.get('catering_establishment'):
-            filters['catering_establishment_dishes__catering_establishment'] = catering_establishment
-
-        return dish_models.Dish.objects.filter(**filters).with_ordering_count().order_by('-orders_count')
+    def get(self, request, *args, **kwargs):
+        query_serializer = dish_serializers.DishesOrderingStatisticsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+
+        statistics = dish_models.DailyDishOrderingStatistics.objects.filter(
+            catering_establishment_dish__catering_establishment__owner=request.user,
+            date__range=(query['start_date'], query['end_date']),
+        )
+        if catering_establishment := query.get('catering_establishment'):
+            statistics = statistics.filter(catering_establishment_dish__catering_establishment=catering_establishment)
+
+        items = get_dishes_ordering_statistics(statistics, query['group_by'], query.get('bucket'), query.get('limit'))
+        serializer = dish_serializers.DishOrderingStatisticsSerializer(items, many=True)
+        if request.accepted_renderer.format != 'json':
+            return Response(serializer.data)
+        if isinstance(items, QuerySet):
+            items = items.iterator(chunk_size=STREAMING_RESPONSE_CHUNK_SIZE)
+        return StreamingJSONArrayResponse(serializer.child.to_representation(item) for item in items)
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:09
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('location', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='address',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['name'], name='location_address_name_trgm', opclasses=('gin_trgm_ops',)
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -47,3 +48,4 @@ class Address(models.Model):
     class Meta:
         verbose_name = _("Address")
         verbose_name_plural = _("Addresses")
+        indexes = (GinIndex(fields=('name',), name='location_address_name_trgm', opclasses=('gin_trgm_ops',)),)
@@ -0,0 +1,9 @@
+"""
+Media administration module.
+"""
+from django.contrib import admin
+
+from uploads import models
+
+
+admin.site.register((models.UploadedMedia, models.StoredImage, models.PendingMediaDeletion))
@@ -0,0 +1,13 @@
+"""
+Uploads application configuration module.
+"""
+from django.apps import AppConfig
+
+
+class UploadsConfig(AppConfig):
+    """
+    Uploads application configuration.
+    """
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'uploads'
@@ -0,0 +1,6 @@
+MEDIA_FOLDER_NAME = 'uploads'
+UPLOADS_FOLDER_NAME = 'files'
+UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+PROCESSED_IMAGE_FORMAT = 'WEBP'
+PROCESSED_IMAGE_QUALITY = 80
+STORED_IMAGES_FOLDER_NAME = 'images'
@@ -0,0 +1,93 @@
+"""
+Image processing pipeline: every stored image is verified, re-encoded without metadata and resized to variants.
+"""
+import io
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from common.constants import IMAGE_VARIANTS_SIZES
+from common.utils import get_image_variant_name, get_image_variants_names
+from uploads.constants import PROCESSED_IMAGE_FORMAT, PROCESSED_IMAGE_QUALITY
+
+_image_processing_pool = None
+_image_processing_pool_lock = threading.Lock()
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+def process_image(source):
+    """
+    Build all variants of an image given as bytes or a file path; runs in worker processes.
+    """
+    try:
+        with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as image:
+            image.verify()
+        # A verified image cannot be decoded any more, so it is opened again.
+        with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as image:
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as ex:
+        raise InvalidImageError(str(ex)) from ex
+
+    variants = {}
+    for variant, size in IMAGE_VARIANTS_SIZES.items():
+        variant_image = image.copy()
+        variant_image.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        # Nothing but the pixels is passed on, so EXIF, ICC and other metadata are dropped.
+        variant_image.save(buffer, format=PROCESSED_IMAGE_FORMAT, quality=PROCESSED_IMAGE_QUALITY)
+        variants[variant] = buffer.getvalue()
+    return variants
+
+
+def get_image_processing_pool():
+    global _image_processing_pool
+
+    with _image_processing_pool_lock:
+        if _image_processing_pool is None:
+            _image_processing_pool = ProcessPoolExecutor(max_workers=settings.IMAGE_PROCESSING_WORKERS)
+        return _image_processing_pool
+
+
+def submit_image_processing(source):
+    """
+    Start processing an image in the worker pool, or right away when the pool is disabled.
+    """
+    if settings.IMAGE_PROCESSING_WORKERS:
+        return get_image_processing_pool().submit(process_image, source)
+
+    future = Future()
+    try:
+        future.set_result(process_image(source))
+    except InvalidImageError as ex:
+        future.set_exception(ex)
+    return future
+
+
+def write_image_variants(name, variants):
+    for variant, content in variants.items():
+        variant_name = get_image_variant_name(name, variant)
+        # Names are derived from the content, so an existing file already holds exactly these bytes.
+        if not default_storage.exists(variant_name):
+            default_storage.save(variant_name, ContentFile(content))
+
+
+def delete_image_with_variants(name):
+    """
+    Delete all variants of an image and return the number of bytes reclaimed.
+    """
+    reclaimed_size = 0
+    for variant_name in get_image_variants_names(name):
+        try:
+            reclaimed_size += default_storage.size(variant_name)
+        except OSError:
+            continue
+        default_storage.delete(variant_name)
+    return reclaimed_size
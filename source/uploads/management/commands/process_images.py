@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catering_establishment.models import CateringEstablishmentPhoto
+from common.constants import PROCESSED_IMAGE_EXTENSION
+from common.utils import get_content_hash
+from dish.models import CateringEstablishmentDish
+from uploads.images import InvalidImageError, submit_image_processing
+from uploads.models import PendingMediaDeletion
+from uploads.services import collect_pending_media_deletions, store_image
+
+
+class Command(BaseCommand):
+    help = 'Re-encode images stored before the processing pipeline was introduced and generate their variants.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        for model in (CateringEstablishmentPhoto, CateringEstablishmentDish):
+            unprocessed = model.objects.exclude(photo__endswith=f'.{PROCESSED_IMAGE_EXTENSION}').only('id', 'photo')
+            instances = list(unprocessed)
+            processed_count = 0
+            for batch_start in range(0, len(instances), options['batch_size']):
+                batch_end = batch_start + options['batch_size']
+                processed_count += self.process_batch(model, instances[batch_start:batch_end])
+            self.stdout.write(self.style.SUCCESS(f'{model.__name__}: {processed_count} of {len(instances)} processed.'))
+        collect_pending_media_deletions()
+
+    def process_batch(self, model, instances):
+        images_processing = [(instance, submit_image_processing(instance.photo.path)) for instance in instances]
+
+        processed_images = []
+        for instance, image_processing in images_processing:
+            try:
+                variants = image_processing.result()
+            except InvalidImageError as ex:
+                self.stderr.write(f'{instance.photo.name}: {ex}')
+                continue
+            with instance.photo.open('rb') as photo_file:
+                instance.photo_hash = get_content_hash(photo_file.read())
+            processed_images.append((instance, variants))
+
+        processed_instances = []
+        with transaction.atomic():
+            for instance, variants in processed_images:
+                PendingMediaDeletion.objects.get_or_create(name=instance.photo.name)
+                instance.photo = store_image(instance.photo_hash, lambda: variants)
+                processed_instances.append(instance)
+            model.objects.bulk_update(processed_instances, ('photo', 'photo_hash'))
+        return len(processed_instances)
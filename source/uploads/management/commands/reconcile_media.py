@@ -0,0 +1,132 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.defaultfilters import filesizeformat
+
+from catering_establishment.models import CateringEstablishmentPhoto
+from common.utils import get_image_variants_names
+from dish.models import CateringEstablishmentDish
+from uploads.constants import MEDIA_FOLDER_NAME, STORED_IMAGES_FOLDER_NAME
+from uploads.models import StoredImage, UploadedMedia
+from uploads.services import collect_pending_media_deletions, delete_expired_uploaded_media
+
+REFERENCING_MODELS = (CateringEstablishmentPhoto, CateringEstablishmentDish)
+
+
+class Command(BaseCommand):
+    help = 'Delete media files that are not referenced by any photo and fix the reference counts of stored images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Maximum number of concurrent file operations.')
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=3600,
+            help='Seconds since the last modification of a file for it to be deleted; '
+            'younger files may belong to transactions that are not committed yet.',
+        )
+        parser.add_argument(
+            '--uploads-max-age',
+            type=int,
+            help='Seconds since the creation of an uploaded media for it to be deleted; '
+            'defaults to the UPLOADED_MEDIA_MAX_AGE setting.',
+        )
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or settings.MEDIA_IO_WORKERS
+        dry_run = options['dry_run']
+
+        if not dry_run:
+            collected_count, collected_size = collect_pending_media_deletions(workers=workers)
+            self.stdout.write(
+                f'Pending deletions: {collected_count} images deleted, {filesizeformat(collected_size)} reclaimed.'
+            )
+            expired_count, expired_size = delete_expired_uploaded_media(options['uploads_max_age'], workers=workers)
+            self.stdout.write(
+                f'Expired uploads: {expired_count} uploads deleted, {filesizeformat(expired_size)} reclaimed.'
+            )
+
+        fixed_count = self.recount_references(dry_run)
+        self.stdout.write(f'Stored images: {fixed_count} reference counts fixed.')
+
+        unreferenced_files = self.find_unreferenced_files(options['min_age'])
+        if dry_run:
+            reclaimed_size = sum(size for _, size in unreferenced_files)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                reclaimed_size = sum(executor.map(self.remove_file, (path for path, _ in unreferenced_files)))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Unreferenced files: {len(unreferenced_files)} {"found" if dry_run else "deleted"}, '
+                f'{filesizeformat(reclaimed_size)} {"reclaimable" if dry_run else "reclaimed"}.'
+            )
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def recount_references(dry_run):
+        # References are counted once the stored images are locked, so that no reference is added meanwhile.
+        stored_images = list(StoredImage.objects.select_for_update())
+        references = Counter()
+        for model in REFERENCING_MODELS:
+            references.update(model.objects.values_list('photo', flat=True).iterator())
+
+        unreferenced_images = []
+        miscounted_images = []
+        for stored_image in stored_images:
+            if not references[stored_image.name]:
+                unreferenced_images.append(stored_image.pk)
+            elif references[stored_image.name] != stored_image.reference_count:
+                stored_image.reference_count = references[stored_image.name]
+                miscounted_images.append(stored_image)
+
+        if not dry_run:
+            StoredImage.objects.bulk_update(miscounted_images, ('reference_count',))
+            StoredImage.objects.filter(pk__in=unreferenced_images).delete()
+        return len(unreferenced_images) + len(miscounted_images)
+
+    @staticmethod
+    def get_referenced_names():
+        referenced_names = set()
+        for model in REFERENCING_MODELS:
+            for name in model.objects.values_list('photo', flat=True).iterator():
+                referenced_names.update(get_image_variants_names(name))
+        referenced_names.update(UploadedMedia.objects.values_list('file', flat=True).iterator())
+        return referenced_names
+
+    def find_unreferenced_files(self, min_age):
+        folders = [model._meta.get_field('photo').upload_to for model in REFERENCING_MODELS]
+        folders += [
+            UploadedMedia._meta.get_field('file').upload_to,
+            f'{MEDIA_FOLDER_NAME}/{STORED_IMAGES_FOLDER_NAME}/',
+        ]
+        referenced_names = self.get_referenced_names()
+        modified_before = time.time() - min_age
+
+        unreferenced_files = []
+        for folder in folders:
+            for directory, _, filenames in os.walk(os.path.join(settings.MEDIA_ROOT, folder)):
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
+                    name = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+                    if name in referenced_names:
+                        continue
+                    stat = os.stat(path)
+                    if stat.st_mtime < modified_before:
+                        unreferenced_files.append((path, stat.st_size))
+        return unreferenced_files
+
+    @staticmethod
+    def remove_file(path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        return size
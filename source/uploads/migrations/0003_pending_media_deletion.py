@@ -0,0 +1,32 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:30
+
+from django.db import migrations, models
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('uploads', '0002_stored_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingMediaDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                (
+                    'created',
+                    django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created'),
+                ),
+                (
+                    'modified',
+                    django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified'),
+                ),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'get_latest_by': 'modified',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+"""
+Media models.
+"""
+from django.conf import settings
+from django.db import models
+from django_extensions.db.models import TimeStampedModel
+
+from uploads.constants import MEDIA_FOLDER_NAME, UPLOADS_FOLDER_NAME
+
+
+class UploadedMedia(TimeStampedModel):
+    """
+    A file uploaded ahead of time to be referenced by id from other requests.
+    """
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='uploaded_media')
+    file = models.FileField(upload_to=f'{MEDIA_FOLDER_NAME}/{UPLOADS_FOLDER_NAME}/')
+    content_hash = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=128, blank=True)
+
+    def __str__(self):
+        return self.file.name
+
+
+class StoredImage(models.Model):
+    """
+    An image stored once under its content hash, with the number of model instances referencing it.
+    """
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    reference_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
+
+class PendingMediaDeletion(TimeStampedModel):
+    """
+    A media file that lost its last reference and is waiting to be deleted by the collector.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,14 @@
+from rest_framework.parsers import MultiPartParser
+
+from uploads.upload_handlers import HashingTemporaryFileUploadHandler
+
+
+class HashingMultiPartParser(MultiPartParser):
+    """
+    Multipart parser that never keeps uploaded files in memory and hashes them while they are received.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']
+        request.upload_handlers = [HashingTemporaryFileUploadHandler(request)]
+        return super().parse(stream, media_type, parser_context)
@@ -0,0 +1,90 @@
+import binascii
+import os
+import re
+from uuid import uuid4
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from common.constants import BASE64_ENCODED_FILE_REGEXP
+from common.utils import build_absolute_url_to_media_file, decode_base64_encoded_file
+from uploads import models as media_models
+from uploads.constants import UPLOAD_MAX_SIZE
+from uploads.sources import EncodedMediaSource, UploadedMediaSource
+
+
+class UploadedMediaSerializer(serializers.ModelSerializer):
+    file = serializers.ImageField(write_only=True)
+
+    class Meta:
+        model = media_models.UploadedMedia
+        fields = ('id', 'file', 'content_hash', 'size')
+        read_only_fields = ('content_hash', 'size')
+
+    def validate_file(self, value):
+        if value.size > UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                _('The file must not be larger than %(size)s bytes.') % {'size': UPLOAD_MAX_SIZE}
+            )
+        return value
+
+    def create(self, validated_data):
+        uploaded_file = validated_data['file']
+        uploaded_file.name = f'{uuid4()}{os.path.splitext(uploaded_file.name)[1].lower()}'
+        return media_models.UploadedMedia.objects.create(
+            owner=self.context['request'].user,
+            file=uploaded_file,
+            content_hash=uploaded_file.content_hash,
+            size=uploaded_file.size,
+            content_type=uploaded_file.content_type or '',
+        )
+
+
+class MediaField(serializers.Field):
+    """
+    Media given either as a base64 encoded file or as the id of a file uploaded by the same user beforehand.
+    """
+
+    default_error_messages = {
+        'invalid': _('Provided encoded data has incorrect format.'),
+        'does_not_exist': _('Uploaded media with id {pk_value} does not exist.'),
+        'no_owner': _('Uploaded media can only be referenced by requests of their owners.'),
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, int) or (isinstance(data, str) and data.isdigit()):
+            return UploadedMediaSource(self.get_uploaded_media(int(data)))
+
+        if not isinstance(data, str) or not re.fullmatch(BASE64_ENCODED_FILE_REGEXP, data):
+            self.fail('invalid')
+        try:
+            return EncodedMediaSource(*decode_base64_encoded_file(data))
+        except binascii.Error as ex:
+            raise serializers.ValidationError(str(ex)) from ex
+
+    def to_representation(self, value):
+        return value
+
+    def get_uploaded_media(self, pk):
+        # Without a request the owner is unknown, and media of other users must not be referenced.
+        if (request := self.context.get('request')) is None:
+            self.fail('no_owner')
+        try:
+            return media_models.UploadedMedia.objects.get(pk=pk, owner=request.user)
+        except media_models.UploadedMedia.DoesNotExist:
+            self.fail('does_not_exist', pk_value=pk)
+
+
+class ImageVariantField(serializers.ImageField):
+    """
+    Image represented by the URL of its variant chosen by the serializer context or the field itself.
+    """
+
+    def __init__(self, variant=None, **kwargs):
+        self.variant = variant
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return build_absolute_url_to_media_file(value.name, self.context.get('image_variant', self.variant))
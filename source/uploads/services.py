@@ -0,0 +1,155 @@
+"""
+Content-addressed image store: an image is written once under its content hash and shared by all its references.
+
+Images that lose their last reference are recorded as pending deletions and deleted in batches by the collector,
+which runs shortly after the releasing transactions commit.
+"""
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from common.constants import PROCESSED_IMAGE_EXTENSION
+from uploads.constants import MEDIA_FOLDER_NAME, STORED_IMAGES_FOLDER_NAME
+from uploads.images import delete_image_with_variants, write_image_variants
+from uploads.models import PendingMediaDeletion, StoredImage, UploadedMedia
+
+_media_collection_lock = threading.Lock()
+_media_collection_timer = None
+
+
+def get_stored_image_name(content_hash):
+    return (
+        f'{MEDIA_FOLDER_NAME}/{STORED_IMAGES_FOLDER_NAME}/{content_hash[:2]}/{content_hash}.{PROCESSED_IMAGE_EXTENSION}'
+    )
+
+
+def is_image_stored(content_hash):
+    return StoredImage.objects.filter(content_hash=content_hash).exists()
+
+
+@transaction.atomic
+def store_image(content_hash, get_variants):
+    """
+    Add a reference to the image with the given content hash, processing and writing it only if it is not stored.
+
+    `get_variants` is called only when the image has to be written and returns its variants by name.
+    """
+    name = get_stored_image_name(content_hash)
+    if StoredImage.objects.filter(content_hash=content_hash).update(reference_count=F('reference_count') + 1):
+        return name
+
+    variants = get_variants()
+    # Waits for a collector deleting the previous files of the image to finish before they are written again.
+    PendingMediaDeletion.objects.filter(name=name).delete()
+    write_image_variants(name, variants)
+    stored_image, created = StoredImage.objects.get_or_create(
+        content_hash=content_hash,
+        defaults={'name': name, 'size': sum(map(len, variants.values())), 'reference_count': 1},
+    )
+    if not created:
+        # The same image was stored by a concurrent request in the meantime.
+        StoredImage.objects.filter(pk=stored_image.pk).update(reference_count=F('reference_count') + 1)
+    return name
+
+
+@transaction.atomic
+def release_image(name):
+    """
+    Remove a reference to a stored image; once the last reference is gone, the image is queued for deletion.
+
+    Images saved before the store was introduced are not counted and have a single reference.
+    """
+    if StoredImage.objects.filter(name=name, reference_count__gt=1).update(reference_count=F('reference_count') - 1):
+        return
+    StoredImage.objects.filter(name=name).delete()
+    PendingMediaDeletion.objects.get_or_create(name=name)
+    transaction.on_commit(schedule_media_collection)
+
+
+def collect_pending_media_deletions(batch_size=None, workers=None):
+    """
+    Delete the files of pending deletions batch by batch, at most `workers` files at a time.
+
+    Returns the number of deleted images and the number of bytes reclaimed.
+    """
+    batch_size = batch_size or settings.MEDIA_COLLECTION_BATCH_SIZE
+    deleted_count = reclaimed_size = 0
+    with ThreadPoolExecutor(max_workers=workers or settings.MEDIA_IO_WORKERS) as executor:
+        while True:
+            with transaction.atomic():
+                # Locked rows are skipped, so concurrent collectors share the work instead of waiting.
+                pending_deletions = list(
+                    PendingMediaDeletion.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size]
+                )
+                if not pending_deletions:
+                    break
+                names = {pending_deletion.name for pending_deletion in pending_deletions}
+                names -= set(StoredImage.objects.filter(name__in=names).values_list('name', flat=True))
+                reclaimed_size += sum(executor.map(delete_image_with_variants, names))
+                deleted_count += len(names)
+                PendingMediaDeletion.objects.filter(
+                    pk__in=[pending_deletion.pk for pending_deletion in pending_deletions]
+                ).delete()
+    return deleted_count, reclaimed_size
+
+
+def delete_expired_uploaded_media(max_age=None, batch_size=None, workers=None):
+    """
+    Delete uploaded media created more than `max_age` seconds ago along with their files.
+
+    Uploads are only referenced by the requests consuming them, which copy their content to the image store, so old
+    uploads are either consumed or abandoned. Returns the number of deleted uploads and the number of bytes reclaimed.
+    """
+    created_before = timezone.now() - datetime.timedelta(seconds=max_age or settings.UPLOADED_MEDIA_MAX_AGE)
+    batch_size = batch_size or settings.MEDIA_COLLECTION_BATCH_SIZE
+    deleted_count = reclaimed_size = 0
+    with ThreadPoolExecutor(max_workers=workers or settings.MEDIA_IO_WORKERS) as executor:
+        while True:
+            with transaction.atomic():
+                expired_uploads = list(
+                    UploadedMedia.objects.select_for_update(skip_locked=True)
+                    .filter(created__lt=created_before)
+                    .order_by('id')[:batch_size]
+                )
+                if not expired_uploads:
+                    break
+                names = [uploaded_media.file.name for uploaded_media in expired_uploads]
+                # The map is consumed, so that the rows are only deleted once their files are.
+                list(executor.map(default_storage.delete, names))
+                reclaimed_size += sum(uploaded_media.size for uploaded_media in expired_uploads)
+                deleted_count += len(expired_uploads)
+                UploadedMedia.objects.filter(pk__in=[uploaded_media.pk for uploaded_media in expired_uploads]).delete()
+    return deleted_count, reclaimed_size
+
+
+def schedule_media_collection():
+    """
+    Collect pending deletions MEDIA_COLLECTION_DELAY seconds after the first of a series of releases.
+
+    Releases arriving while a collection is pending are coalesced into it.
+    """
+    global _media_collection_timer  # pylint: disable=global-statement
+
+    with _media_collection_lock:
+        if _media_collection_timer is not None:
+            return
+        _media_collection_timer = threading.Timer(settings.MEDIA_COLLECTION_DELAY, _collect_scheduled_media)
+        _media_collection_timer.daemon = True
+        _media_collection_timer.start()
+
+
+def _collect_scheduled_media():
+    global _media_collection_timer  # pylint: disable=global-statement
+
+    with _media_collection_lock:
+        _media_collection_timer = None
+    try:
+        collect_pending_media_deletions()
+    finally:
+        connections.close_all()
@@ -0,0 +1,53 @@
+"""
+Media contents accepted by serializers, independent of the way they were transferred.
+
+Processing of every image that is not stored yet starts in the worker pool as soon as its source is built, so all
+new images of a request are processed in parallel while the request is being validated.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from common.utils import get_content_hash
+from uploads.images import InvalidImageError, submit_image_processing
+from uploads.services import is_image_stored, store_image
+
+
+class MediaSource:
+    def __init__(self, content_hash, image_source):
+        self.content_hash = content_hash
+        self.image_source = image_source
+        self.image_processing = None if is_image_stored(content_hash) else submit_image_processing(image_source)
+
+    def get_variants(self):
+        if self.image_processing is None:
+            # The stored image lost its last reference after validation.
+            self.image_processing = submit_image_processing(self.image_source)
+        try:
+            return self.image_processing.result()
+        except InvalidImageError as ex:
+            raise serializers.ValidationError(
+                _('Upload a valid image. The file you uploaded was either not an image or a corrupted image.')
+            ) from ex
+
+    def save(self):
+        return store_image(self.content_hash, self.get_variants)
+
+
+class EncodedMediaSource(MediaSource):
+    """
+    Media content decoded from a base64 string sent inside a JSON body.
+    """
+
+    def __init__(self, content, file_format):
+        super().__init__(get_content_hash(content), content)
+
+
+class UploadedMediaSource(MediaSource):
+    """
+    Media content uploaded ahead of time through the streaming upload endpoint.
+    """
+
+    def __init__(self, uploaded_media):
+        self.uploaded_media = uploaded_media
+        # Workers read the uploaded file themselves instead of receiving its content through a pipe.
+        super().__init__(uploaded_media.content_hash, uploaded_media.file.path)
@@ -0,0 +1,22 @@
+import hashlib
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream uploaded files into temporary files, hashing their content chunk by chunk on the way.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.content_hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.content_hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.content_hash = self.content_hasher.hexdigest()
+        return uploaded_file
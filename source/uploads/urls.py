@@ -0,0 +1,8 @@
+from django.urls import path
+
+from uploads import views
+
+
+urlpatterns = [
+    path('', views.MediaUploadView.as_view()),
+]
@@ -0,0 +1,14 @@
+"""
+Media views.
+"""
+from rest_framework.generics import CreateAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from uploads import serializers as media_serializers
+from uploads.parsers import HashingMultiPartParser
+
+
+class MediaUploadView(CreateAPIView):
+    permission_classes = (IsAuthenticated,)
+    parser_classes = (HashingMultiPartParser,)
+    serializer_class = media_serializers.UploadedMediaSerializer
@@ -0,0 +1,16 @@
+# Generated by Django 4.1.6 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('user', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userbalancechange',
+            index=models.Index(fields=['user', 'transaction_datetime'], name='user_userba_user_id_eac7b5_idx'),
+        ),
+    ]
@@ -32,3 +32,6 @@ class UserBalanceChange(models.Model):
 
     def __str__(self):
         return f'{self.user.username}: {self.amount} ({self.transaction_datetime})'  # pylint: disable=no-member
+
+    class Meta:
+        indexes = (models.Index(fields=('user', 'transaction_datetime')),)